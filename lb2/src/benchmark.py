@@ -2,6 +2,7 @@ import time
 import numpy as np
 import matplotlib.pyplot as plt
 from tsp_algorithms import solve_tsp
+from tsp_parallel import solve_tsp_batch
 from utils import generate_matrix
 from concurrent.futures import ProcessPoolExecutor
 
@@ -92,5 +93,56 @@ def benchmark_tsp(matrix_sizes, runs=10):
     plt.tight_layout()
     plt.show()
 
+def benchmark_parallel(size, worker_counts, runs=3, seed=52):
+    """Измеряет ускорение параллельного алгоритма Литтла в зависимости от числа процессов."""
+    matrix = generate_matrix(size, seed=seed)
+    times = []
+    for workers in worker_counts:
+        start_time = time.perf_counter()
+        for _ in range(runs):
+            best_solution = solve_tsp(matrix, 'little', workers=workers)
+        times.append((time.perf_counter() - start_time) / runs)
+    
+    print(f"\nПараллельный алгоритм Литтла, размер матрицы {size}, стоимость {best_solution['cost']}:\n")
+    print(f"{'Процессы':<10}{'Время':<15}{'Ускорение':<15}")
+    print("-" * 40)
+    for workers, elapsed in zip(worker_counts, times):
+        print(f"{workers:<10}{elapsed:<15.4f}{times[0] / elapsed:<15.2f}")
+    
+    plt.figure(figsize=(10, 6))
+    plt.plot(worker_counts, [times[0] / elapsed for elapsed in times], label='Little Parallel', marker='o')
+    plt.plot(worker_counts, [workers / worker_counts[0] for workers in worker_counts], 'r--', label='Линейное ускорение')
+    plt.xlabel('Число процессов')
+    plt.ylabel('Ускорение')
+    plt.title(f'Ускорение параллельного алгоритма Литтла (n = {size})')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+def benchmark_batch(size, count, worker_counts, method='little', seed=52):
+    """Измеряет пропускную способность пакетного решения (матриц в секунду) в зависимости от числа процессов."""
+    matrices = [generate_matrix(size, seed=seed + index) for index in range(count)]
+    throughputs = []
+    for workers in worker_counts:
+        start_time = time.perf_counter()
+        for _ in solve_tsp_batch(matrices, method, workers=workers):
+            pass
+        throughputs.append(count / (time.perf_counter() - start_time))
+    
+    print(f"\nПакетное решение методом {method}: {count} матриц размера {size}:\n")
+    print(f"{'Процессы':<10}{'Матриц/с':<15}{'Ускорение':<15}")
+    print("-" * 40)
+    for workers, throughput in zip(worker_counts, throughputs):
+        print(f"{workers:<10}{throughput:<15.1f}{throughput / throughputs[0]:<15.2f}")
+    
+    plt.figure(figsize=(10, 6))
+    plt.plot(worker_counts, throughputs, label=f'solve_tsp_batch ({method})', marker='o')
+    plt.xlabel('Число процессов')
+    plt.ylabel('Матриц в секунду')
+    plt.title(f'Пропускная способность пакетного решения (n = {size})')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
 if __name__ == '__main__':
     benchmark_tsp([i for i in range(4, 21, 2)])
@@ -0,0 +1,280 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from statistics import median
+import numpy as np
+import matplotlib.pyplot as plt
+from tabulate import tabulate
+from tsp_algorithms import solve_tsp
+from utils import generate_matrix
+
+# Семейства тестовых матриц: имя -> параметр symmetric для generate_matrix
+FAMILIES = {'asymmetric': False, 'symmetric': True}
+# Допустимый относительный рост метрик по сравнению с эталоном
+DEFAULT_THRESHOLDS = {'time': 0.25, 'nodes': 0.10, 'peak_memory': 0.25, 'gap': 0.01}
+# Время ниже этого порога (секунды) считается шумом и не сравнивается
+MIN_COMPARED_TIME = 0.005
+
+
+def measure_solve(matrix, method, repeats=3, **options):
+    """
+    Замеряет один метод на одной матрице.
+
+    Время измеряется perf_counter отдельно от памяти: tracemalloc замедляет
+    выделение памяти, поэтому пиковая память снимается дополнительным запуском.
+    Для метода 'little' число развёрнутых узлов берётся из статистики поиска.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray)
+    method -- метод решения (str)
+    repeats -- число замеров времени (int, по умолчанию 3)
+    options -- параметры метода
+
+    Возвращает:
+    measurement -- стоимость, время всех запусков, число узлов и пиковая память в байтах (dict)
+    """
+    if method == 'little':
+        options = dict(options, collect_stats=True)
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        solution = solve_tsp(matrix, method, **options)
+        times.append(time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    try:
+        solve_tsp(matrix, method, **options)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    stats = solution.get('stats')
+    return {
+        'cost': float(solution['cost']),
+        'times': times,
+        'time': median(times),
+        'nodes': stats['nodes_expanded'] if stats else None,
+        'peak_memory': peak_memory,
+    }
+
+
+def run_suite(sizes, seeds=10, families=tuple(FAMILIES), methods=('little', 'nearest', 'nn+2opt'), repeats=3,
+              verbose=True):
+    """
+    Запускает набор замеров: каждый метод на seeds матрицах каждого размера и семейства.
+
+    Оптимум для расчёта отклонения находится точным методом Литтла (результат
+    метода 'little', если он замеряется, используется повторно).
+
+    Аргументы:
+    sizes -- размеры матриц (list)
+    seeds -- число матриц каждого размера и семейства, seed = 0..seeds-1 (int, по умолчанию 10)
+    families -- семейства матриц из FAMILIES (tuple, по умолчанию все)
+    methods -- замеряемые методы (tuple, по умолчанию 'little', 'nearest', 'nn+2opt')
+    repeats -- число замеров времени для каждого запуска (int, по умолчанию 3)
+    verbose -- выводить ход замеров (bool, по умолчанию True)
+
+    Возвращает:
+    results -- описание окружения, отдельные замеры и сводка по (метод, семейство, размер) (dict)
+
+    Исключения:
+    ValueError -- если передано неизвестное семейство
+    """
+    for family in families:
+        if family not in FAMILIES:
+            raise ValueError(f"Unsupported family: {family}. Supported families are {', '.join(map(repr, FAMILIES))}.")
+    cases = []
+    for family in families:
+        for size in sizes:
+            for seed in range(seeds):
+                matrix = generate_matrix(size, seed=seed, symmetric=FAMILIES[family])
+                measurements = {method: measure_solve(matrix, method, repeats) for method in methods}
+                if 'little' in measurements:
+                    optimum = measurements['little']['cost']
+                else:
+                    optimum = float(solve_tsp(matrix, 'little')['cost'])
+                for method, measurement in measurements.items():
+                    gap = (measurement['cost'] - optimum) / optimum if optimum else 0.0
+                    cases.append({'method': method, 'family': family, 'size': size, 'seed': seed,
+                                  'optimum': optimum, 'gap': gap, **measurement})
+            if verbose:
+                print(f"⏱️ {family}, n = {size}: {seeds} матриц замерено")
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'config': {'sizes': list(sizes), 'seeds': seeds, 'families': list(families),
+                   'methods': list(methods), 'repeats': repeats},
+        'cases': cases,
+        'summary': summarize(cases),
+    }
+
+
+def summarize(cases):
+    """
+    Сводит замеры по группам (метод, семейство, размер).
+
+    Возвращает:
+    summary -- словарь {"метод/семейство/размер": медиана времени, среднее число узлов,
+               наибольшая пиковая память, среднее и наибольшее отклонение от оптимума} (dict)
+    """
+    groups = {}
+    for case in cases:
+        groups.setdefault(f"{case['method']}/{case['family']}/{case['size']}", []).append(case)
+    summary = {}
+    for key, group in groups.items():
+        nodes = [case['nodes'] for case in group if case['nodes'] is not None]
+        summary[key] = {
+            'method': group[0]['method'],
+            'family': group[0]['family'],
+            'size': group[0]['size'],
+            'runs': len(group),
+            'time': median(case['time'] for case in group),
+            'nodes': sum(nodes) / len(nodes) if nodes else None,
+            'peak_memory': max(case['peak_memory'] for case in group),
+            'gap': sum(case['gap'] for case in group) / len(group),
+            'max_gap': max(case['gap'] for case in group),
+        }
+    return summary
+
+
+def save_results(results, filename):
+    """Сохраняет результаты замеров в JSON."""
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+def load_results(filename):
+    """Загружает результаты замеров из JSON."""
+    with open(filename, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare_results(baseline, current, thresholds=None):
+    """
+    Сравнивает сводки двух наборов замеров и находит регрессии.
+
+    Время, число узлов и память сравниваются по относительному росту, отклонение
+    от оптимума — по абсолютному (доля). Время короче MIN_COMPARED_TIME не
+    сравнивается. Группы, которых нет в одном из наборов, пропускаются.
+
+    Аргументы:
+    baseline -- эталонные результаты run_suite (dict)
+    current -- новые результаты run_suite (dict)
+    thresholds -- допустимый рост метрик, см. DEFAULT_THRESHOLDS (dict, по умолчанию None)
+
+    Возвращает:
+    regressions -- список регрессий: группа, метрика, эталон, новое значение, изменение (list)
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    regressions = []
+    for key, new in current['summary'].items():
+        old = baseline['summary'].get(key)
+        if old is None:
+            continue
+        for metric in ('time', 'nodes', 'peak_memory'):
+            if old[metric] is None or new[metric] is None or old[metric] <= 0:
+                continue
+            if metric == 'time' and max(old[metric], new[metric]) < MIN_COMPARED_TIME:
+                continue
+            change = (new[metric] - old[metric]) / old[metric]
+            if change > thresholds[metric]:
+                regressions.append({'group': key, 'metric': metric, 'baseline': old[metric],
+                                    'current': new[metric], 'change': change})
+        change = new['gap'] - old['gap']
+        if change > thresholds['gap']:
+            regressions.append({'group': key, 'metric': 'gap', 'baseline': old['gap'],
+                                'current': new['gap'], 'change': change})
+    return regressions
+
+
+def print_summary(results):
+    """Выводит сводку замеров таблицей."""
+    rows = [[entry['method'], entry['family'], entry['size'], entry['runs'], f"{entry['time']:.5f}",
+             '-' if entry['nodes'] is None else f"{entry['nodes']:.1f}", f"{entry['peak_memory'] / 1024:.1f}",
+             f"{entry['gap'] * 100:.2f}", f"{entry['max_gap'] * 100:.2f}"]
+            for entry in results['summary'].values()]
+    headers = ['Метод', 'Семейство', 'Размер', 'Матриц', 'Время, с', 'Узлы', 'Память, КБ', 'Откл., %', 'Макс. откл., %']
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
+def print_regressions(regressions):
+    """Выводит найденные регрессии таблицей."""
+    if not regressions:
+        print("✅ Регрессий не найдено")
+        return
+    rows = [[item['group'], item['metric'], f"{item['baseline']:.5g}", f"{item['current']:.5g}",
+             f"{item['change'] * 100:+.1f}%"] for item in regressions]
+    print(f"❌ Найдено регрессий: {len(regressions)}")
+    print(tabulate(rows, headers=['Группа', 'Метрика', 'Эталон', 'Сейчас', 'Изменение'], tablefmt="grid"))
+
+
+def plot_scaling(results, metric='time'):
+    """Строит кривые масштабирования метрики по размеру матрицы для каждой пары (метод, семейство)."""
+    curves = {}
+    for entry in results['summary'].values():
+        if entry[metric] is not None:
+            curves.setdefault((entry['method'], entry['family']), []).append((entry['size'], entry[metric]))
+    plt.figure(figsize=(10, 6))
+    for (method, family), points in sorted(curves.items()):
+        points.sort()
+        plt.plot([size for size, _ in points], [value for _, value in points], label=f'{method} ({family})', marker='o')
+    plt.xlabel('Размер матрицы')
+    plt.ylabel(metric)
+    if metric in ('time', 'nodes'):
+        plt.yscale('log')
+    plt.title(f'Масштабирование: {metric}')
+    plt.legend()
+    plt.grid(True)
+    plt.show()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description='Воспроизводимые замеры методов решения задачи коммивояжера')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='выполнить замеры и сохранить JSON')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=[6, 8, 10, 12])
+    run_parser.add_argument('--seeds', type=int, default=10)
+    run_parser.add_argument('--families', nargs='+', default=list(FAMILIES), choices=list(FAMILIES))
+    run_parser.add_argument('--methods', nargs='+', default=['little', 'nearest', 'nn+2opt'])
+    run_parser.add_argument('--repeats', type=int, default=3)
+    run_parser.add_argument('--output', default='benchmark_results.json')
+    run_parser.add_argument('--baseline', help='сразу сравнить с эталонным JSON')
+    run_parser.add_argument('--plot', action='store_true', help='построить кривые масштабирования')
+    compare_parser = commands.add_parser('compare', help='сравнить два JSON с результатами')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    for parser_ in (run_parser, compare_parser):
+        for metric, default in DEFAULT_THRESHOLDS.items():
+            parser_.add_argument(f'--max-{metric.replace("_", "-")}', dest=metric, type=float, default=default,
+                                 help=f'допустимый рост {metric} (по умолчанию {default})')
+    arguments = parser.parse_args(arguments)
+    thresholds = {metric: getattr(arguments, metric) for metric in DEFAULT_THRESHOLDS}
+
+    if arguments.command == 'run':
+        results = run_suite(arguments.sizes, arguments.seeds, arguments.families, arguments.methods, arguments.repeats)
+        save_results(results, arguments.output)
+        print_summary(results)
+        print(f"💾 Результаты сохранены в {arguments.output}")
+        if arguments.plot:
+            plot_scaling(results)
+        if arguments.baseline is None:
+            return 0
+        baseline = load_results(arguments.baseline)
+    else:
+        baseline = load_results(arguments.baseline)
+        results = load_results(arguments.current)
+    regressions = compare_results(baseline, results, thresholds)
+    print_regressions(regressions)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
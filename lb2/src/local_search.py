@@ -0,0 +1,303 @@
+import numpy as np
+from collections import deque
+from math import inf
+from matrix_storage import SymmetricMatrix
+
+
+def neighbor_lists(matrix, k=10):
+    """Строит списки ближайших соседей: для каждого города k самых дешёвых исходящих переходов.
+
+    Упакованная симметричная матрица обрабатывается построчно, без
+    построения плотной копии.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray или SymmetricMatrix)
+    k -- число соседей (int, по умолчанию 10)
+
+    Возвращает:
+    neighbors -- массив n x k индексов соседей, упорядоченных по стоимости (numpy.ndarray)
+    """
+    num_cities = len(matrix)
+    k = max(1, min(k, num_cities - 1))
+    if isinstance(matrix, SymmetricMatrix):
+        neighbors = np.empty((num_cities, k), dtype=int)
+        for city in range(num_cities):
+            row = matrix.row(city)
+            row[city] = inf
+            nearest = np.argpartition(row, k - 1)[:k]
+            neighbors[city] = nearest[np.argsort(row[nearest], kind='stable')]
+        return neighbors
+    costs = np.array(matrix, dtype=float)
+    np.fill_diagonal(costs, inf)
+    nearest = np.argpartition(costs, k - 1, axis=1)[:, :k]
+    order = np.argsort(np.take_along_axis(costs, nearest, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(nearest, order, axis=1)
+
+
+def matrix_cost(matrix):
+    """Возвращает векторизованную функцию стоимости переходов cost(a, b) по матрице.
+
+    Бесконечные переходы заменяются большим конечным штрафом, чтобы разности
+    стоимостей оставались определёнными; штраф превышает стоимость любого
+    маршрута из конечных ребер.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray или SymmetricMatrix)
+
+    Возвращает:
+    cost -- функция cost(a, b) для массивов индексов (callable)
+    """
+    if isinstance(matrix, SymmetricMatrix):
+        values = np.asarray(matrix.values, dtype=float)
+        finite = np.isfinite(values)
+        if not finite.all():
+            penalty = (np.abs(values[finite]).max(initial=0.0) + 1.0) * len(matrix) * 2
+            values = np.where(finite, values, penalty)
+        packed = SymmetricMatrix(values, len(matrix), matrix.diagonal)
+        return lambda a, b: packed[a, b]
+    matrix = np.asarray(matrix, dtype=float)
+    finite = np.isfinite(matrix)
+    if not finite.all():
+        penalty = (np.abs(matrix[finite]).max(initial=0.0) + 1.0) * len(matrix) * 2
+        matrix = np.where(finite, matrix, penalty)
+    return lambda a, b: matrix[a, b]
+
+
+def tour_cost(cost, tour):
+    """Вычисляет стоимость замкнутого маршрута.
+
+    Аргументы:
+    cost -- функция стоимости переходов cost(a, b) (callable)
+    tour -- порядок обхода городов без повтора начального (numpy.ndarray)
+
+    Возвращает:
+    total_cost -- стоимость маршрута (float)
+    """
+    return float(cost(tour, np.roll(tour, -1)).sum())
+
+
+def _segment_sums(prefix, start, end, num_cities):
+    """Сумма ребер e_start..e_{end-1} циклического маршрута по префиксным суммам."""
+    return np.where(end >= start, prefix[end] - prefix[start], prefix[num_cities] - prefix[start] + prefix[end])
+
+
+def two_opt(cost, tour, neighbors, verbose=False):
+    """Улучшает маршрут ходами 2-opt с учётом несимметричных стоимостей.
+
+    Ход (i, j) удаляет ребра t_i -> t_i+1 и t_j -> t_j+1, добавляет
+    t_i -> t_j и t_i+1 -> t_j+1 и разворачивает участок t_i+1..t_j. Стоимость
+    развёрнутого участка берётся из префиксных сумм прямых и обратных ребер,
+    поэтому все кандидаты города оцениваются одной векторной операцией.
+    Кандидаты ограничены списками соседей, города без улучшающих ходов
+    помечаются битом «не смотреть», пока соседние ребра не изменятся.
+
+    Аргументы:
+    cost -- функция стоимости переходов cost(a, b) (callable)
+    tour -- порядок обхода городов (numpy.ndarray), не изменяется
+    neighbors -- списки соседей n x k (numpy.ndarray)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+
+    Возвращает:
+    tour -- улучшенный маршрут (numpy.ndarray)
+    improved -- был ли найден хотя бы один улучшающий ход (bool)
+    """
+    tour = np.array(tour)
+    num_cities = len(tour)
+    if num_cities < 4:
+        return tour, False
+    position = np.empty(num_cities, dtype=int)
+    position[tour] = np.arange(num_cities)
+    dont_look = np.zeros(num_cities, dtype=bool)
+    queue = deque(tour.tolist())
+    improved = False
+
+    def prefixes():
+        following = np.roll(tour, -1)
+        forward = np.concatenate(([0.0], np.cumsum(cost(tour, following))))
+        backward = np.concatenate(([0.0], np.cumsum(cost(following, tour))))
+        return forward, backward
+
+    forward, backward = prefixes()
+    while queue:
+        city = queue.popleft()
+        if dont_look[city]:
+            continue
+        # Новое ребро city -> b: city в позиции i (первый вариант) или в позиции i + 1 (второй)
+        first_i = np.full(neighbors.shape[1], position[city])
+        first_j = position[neighbors[city]]
+        second_i = (position[city] - 1) % num_cities
+        second_j = (position[neighbors[city]] - 1) % num_cities
+        i = np.concatenate((first_i, np.full(neighbors.shape[1], second_i)))
+        j = np.concatenate((first_j, second_j))
+        valid = (i != j) & ((i + 1) % num_cities != j) & ((j + 1) % num_cities != i)
+        i, j = i[valid], j[valid]
+        if len(i) == 0:
+            dont_look[city] = True
+            continue
+
+        i_next = (i + 1) % num_cities
+        j_next = (j + 1) % num_cities
+        t_i, t_i_next, t_j, t_j_next = tour[i], tour[i_next], tour[j], tour[j_next]
+        with np.errstate(invalid='ignore'):
+            delta = (cost(t_i, t_j) + cost(t_i_next, t_j_next) - cost(t_i, t_i_next) - cost(t_j, t_j_next)
+                     + _segment_sums(backward, i_next, j, num_cities) - _segment_sums(forward, i_next, j, num_cities))
+        best = int(np.argmin(delta))
+        if not delta[best] < -1e-9:
+            dont_look[city] = True
+            continue
+
+        segment = (i_next[best] + np.arange((j[best] - i_next[best]) % num_cities + 1)) % num_cities
+        tour[segment] = tour[segment[::-1]]
+        position[tour[segment]] = segment
+        forward, backward = prefixes()
+        improved = True
+        for endpoint in (t_i[best], t_i_next[best], t_j[best], t_j_next[best]):
+            dont_look[endpoint] = False
+            queue.append(endpoint)
+        if verbose:
+            print(f"2-opt: ребра {t_i[best]}->{t_i_next[best]} и {t_j[best]}->{t_j_next[best]} заменены, "
+                  f"выигрыш {-delta[best]}")
+
+    return tour, improved
+
+
+def or_opt(cost, tour, neighbors, max_segment=3, verbose=False):
+    """Улучшает маршрут ходами Or-opt: перенос участка из 1..max_segment городов.
+
+    Участок, начинающийся в текущем городе, переносится без разворота перед
+    одним из соседей его последнего города. Все позиции вставки и длины
+    участка оцениваются одной векторной операцией; используются биты
+    «не смотреть», как в two_opt.
+
+    Аргументы:
+    cost -- функция стоимости переходов cost(a, b) (callable)
+    tour -- порядок обхода городов (numpy.ndarray), не изменяется
+    neighbors -- списки соседей n x k (numpy.ndarray)
+    max_segment -- максимальная длина переносимого участка (int, по умолчанию 3)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+
+    Возвращает:
+    tour -- улучшенный маршрут (numpy.ndarray)
+    improved -- был ли найден хотя бы один улучшающий ход (bool)
+    """
+    tour = np.array(tour)
+    num_cities = len(tour)
+    if num_cities < 4:
+        return tour, False
+    position = np.empty(num_cities, dtype=int)
+    position[tour] = np.arange(num_cities)
+    dont_look = np.zeros(num_cities, dtype=bool)
+    queue = deque(tour.tolist())
+    improved = False
+    max_segment = min(max_segment, num_cities - 3)
+
+    while queue:
+        city = queue.popleft()
+        if dont_look[city]:
+            continue
+        start = position[city]
+        best_delta, best_move = -1e-9, None
+        for length in range(1, max_segment + 1):
+            end = (start + length - 1) % num_cities
+            first, last = tour[start], tour[end]
+            before, after = tour[(start - 1) % num_cities], tour[(end + 1) % num_cities]
+            removal = cost(before, after) - cost(before, first) - cost(last, after)
+
+            # Вставка между u = pred(v) и v, где v — сосед последнего города участка
+            v_position = position[neighbors[last]]
+            offset = (v_position - start) % num_cities
+            valid = offset > length
+            v_position = v_position[valid]
+            v = tour[v_position]
+            u = tour[(v_position - 1) % num_cities]
+            if len(v) == 0:
+                continue
+            with np.errstate(invalid='ignore'):
+                delta = removal + cost(u, first) + cost(last, v) - cost(u, v)
+            best = int(np.argmin(delta))
+            if delta[best] < best_delta:
+                best_delta, best_move = delta[best], (length, v_position[best])
+
+        if best_move is None:
+            dont_look[city] = True
+            continue
+
+        length, v_position = best_move
+        segment_positions = (start + np.arange(length)) % num_cities
+        segment = tour[segment_positions]
+        touched = [tour[(start - 1) % num_cities], tour[(start + length) % num_cities],
+                   tour[(v_position - 1) % num_cities], tour[v_position]]
+        rest = np.delete(tour, segment_positions)
+        insert_at = int(np.flatnonzero(rest == tour[v_position])[0])
+        tour = np.concatenate((rest[:insert_at], segment, rest[insert_at:]))
+        position[tour] = np.arange(num_cities)
+        improved = True
+        for endpoint in touched + [segment[0], segment[-1]]:
+            dont_look[endpoint] = False
+            queue.append(endpoint)
+        if verbose:
+            print(f"Or-opt: участок {segment.tolist()} перенесён перед городом {touched[3]}, выигрыш {-best_delta}")
+
+    return tour, improved
+
+
+def optimize_tour(cost, tour, neighbors, moves=('2opt', 'oropt'), verbose=False):
+    """Применяет ходы из moves по очереди, пока хотя бы один из них находит улучшение.
+
+    Аргументы:
+    cost -- функция стоимости переходов cost(a, b) (callable)
+    tour -- порядок обхода городов (numpy.ndarray), не изменяется
+    neighbors -- списки соседей n x k (numpy.ndarray)
+    moves -- используемые ходы: '2opt' и/или 'oropt' (tuple, по умолчанию оба)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+
+    Возвращает:
+    tour -- маршрут в локальном оптимуме (numpy.ndarray)
+
+    Исключения:
+    ValueError -- если передан неподдерживаемый ход
+    """
+    unsupported = set(moves) - {'2opt', 'oropt'}
+    if unsupported:
+        raise ValueError(f"Unsupported moves: {sorted(unsupported)}. Supported moves are '2opt', 'oropt'.")
+    improved = True
+    while improved:
+        improved = False
+        if '2opt' in moves:
+            tour, changed = two_opt(cost, tour, neighbors, verbose)
+            improved |= changed
+        if 'oropt' in moves:
+            tour, changed = or_opt(cost, tour, neighbors, verbose=verbose)
+            improved |= changed
+    return tour
+
+
+def improve_tour(matrix, path, moves=('2opt', 'oropt'), neighbors=10, verbose=False):
+    """Улучшает маршрут локальным поиском до локального оптимума (см. optimize_tour).
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray или SymmetricMatrix)
+    path -- маршрут в формате решателей: [0, ..., 0] (list)
+    moves -- используемые ходы: '2opt' и/или 'oropt' (tuple, по умолчанию оба)
+    neighbors -- размер списков соседей (int, по умолчанию 10)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+
+    Возвращает:
+    solution -- улучшенный путь и его стоимость (dict)
+
+    Исключения:
+    ValueError -- если передан неподдерживаемый ход
+    """
+    unsupported = set(moves) - {'2opt', 'oropt'}
+    if unsupported:
+        raise ValueError(f"Unsupported moves: {sorted(unsupported)}. Supported moves are '2opt', 'oropt'.")
+    if not isinstance(matrix, SymmetricMatrix):
+        matrix = np.asarray(matrix, dtype=float)
+    if not path:
+        return {'cost': inf, 'path': []}
+
+    tour = optimize_tour(matrix_cost(matrix), np.array(path[:-1]), neighbor_lists(matrix, neighbors), moves, verbose)
+    tour = np.roll(tour, -int(np.flatnonzero(tour == 0)[0]))
+    path = tour.tolist() + [0]
+    total_cost = float(sum(matrix[path[i], path[i + 1]] for i in range(len(tour))))
+    return {'cost': total_cost, 'path': path}
@@ -0,0 +1,346 @@
+import json
+import struct
+import numpy as np
+from math import inf
+
+# Формат файла .tspm: сигнатура, длина JSON-заголовка (uint64, little-endian),
+# заголовок и блоки данных матриц, выровненные по ALIGNMENT байт
+MAGIC = b'TSPMAT01'
+ALIGNMENT = 64
+# Значение uint16, обозначающее запрещённый переход (INF)
+UINT16_MISSING = np.iinfo(np.uint16).max
+STORAGE_DTYPES = ('float32', 'float64', 'uint16')
+
+
+def is_symmetric(matrix):
+    """Проверяет, симметрична ли матрица затрат.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray или SymmetricMatrix)
+
+    Возвращает:
+    symmetric -- True, если matrix[i][j] == matrix[j][i] для всех i, j (bool)
+    """
+    if isinstance(matrix, SymmetricMatrix):
+        return True
+    matrix = np.asarray(matrix)
+    return matrix.ndim == 2 and matrix.shape[0] == matrix.shape[1] and np.array_equal(matrix, matrix.T)
+
+
+def has_uniform_diagonal(matrix):
+    """Проверяет, что все диагональные элементы матрицы равны (условие упаковки в SymmetricMatrix).
+
+    Аргументы:
+    matrix -- квадратная матрица затрат (numpy.ndarray)
+
+    Возвращает:
+    uniform -- True, если диагональ состоит из одного значения (bool)
+    """
+    diagonal = np.diagonal(matrix)
+    return bool(np.array_equal(diagonal, np.full_like(diagonal, diagonal[0]), equal_nan=True)) if len(diagonal) else True
+
+
+class SymmetricMatrix:
+    """Симметричная матрица затрат, хранящая только элементы над диагональю.
+
+    Элементы i < j лежат построчно в одномерном массиве длины n(n-1)/2, все
+    диагональные элементы равны значению diagonal. По сравнению с плотной
+    матрицей расход памяти меньше более чем вдвое.
+
+    Поддерживаются обращения matrix[i][j], matrix[i, j] и векторные
+    matrix[a, b] для массивов индексов; matrix[i] возвращает строку как
+    numpy.ndarray. np.asarray(matrix) строит плотную матрицу. Массив values
+    может быть отображением файла (numpy.memmap) с целочисленными весами:
+    значение missing при чтении заменяется на inf.
+    """
+
+    def __init__(self, values, size, diagonal=inf, missing=None):
+        """
+        Аргументы:
+        values -- элементы над диагональю построчно, длина size*(size-1)/2 (numpy.ndarray)
+        size -- число городов (int)
+        diagonal -- значение диагональных элементов (float, по умолчанию inf)
+        missing -- значение values, обозначающее запрещённый переход (по умолчанию None — нет)
+
+        Исключения:
+        ValueError -- если длина values не соответствует size
+        """
+        values = np.asarray(values)
+        if values.shape != (size * (size - 1) // 2,):
+            raise ValueError(f"Expected {size * (size - 1) // 2} packed values for size {size}, got {values.shape}")
+        self.values = values
+        self.size = size
+        self.diagonal = diagonal
+        self.missing = missing
+
+    @classmethod
+    def from_dense(cls, matrix, dtype=float):
+        """Упаковывает плотную симметричную матрицу.
+
+        Аргументы:
+        matrix -- симметричная матрица затрат (numpy.ndarray)
+        dtype -- тип хранимых элементов (по умолчанию float)
+
+        Возвращает:
+        packed -- упакованная матрица (SymmetricMatrix)
+
+        Исключения:
+        ValueError -- если матрица не квадратная, не симметрична или её диагональ неоднородна
+        """
+        matrix = np.asarray(matrix)
+        if not is_symmetric(matrix):
+            raise ValueError("Matrix must be square and symmetric")
+        if not has_uniform_diagonal(matrix):
+            raise ValueError("Matrix must have a uniform diagonal to be packed")
+        size = len(matrix)
+        diagonal = matrix[0, 0] if size else inf
+        return cls(matrix[np.triu_indices(size, 1)].astype(dtype), size, diagonal)
+
+    @property
+    def shape(self):
+        return self.size, self.size
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def __len__(self):
+        return self.size
+
+    def index(self, i, j):
+        """Возвращает позиции элементов (i, j) в упакованном массиве; i и j не должны совпадать."""
+        low = np.minimum(i, j)
+        high = np.maximum(i, j)
+        return low * (2 * self.size - low - 1) // 2 + high - low - 1
+
+    def _read(self, positions):
+        """Читает элементы упакованного массива, заменяя missing на inf."""
+        values = np.asarray(self.values[positions], dtype=np.result_type(self.values, float))
+        if self.missing is not None:
+            values[self.values[positions] == self.missing] = inf
+        return values
+
+    def row(self, i):
+        """Возвращает строку i как плотный массив (numpy.ndarray)."""
+        row = np.empty(self.size, dtype=np.result_type(self.values, float))
+        above = np.arange(i)
+        row[:i] = self._read(self.index(above, i))
+        row[i] = self.diagonal
+        start = self.index(i, i + 1) if i + 1 < self.size else 0
+        row[i + 1:] = self._read(slice(start, start + self.size - i - 1))
+        return row
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            i, j = (np.asarray(index) for index in key)
+            diagonal = i == j
+            if np.ndim(diagonal) == 0:
+                return self.diagonal if diagonal else self._read(self.index(i, j))[()]
+            result = np.full(np.broadcast(i, j).shape, self.diagonal, dtype=np.result_type(self.values, float))
+            result[~diagonal] = self._read(self.index(*np.broadcast_arrays(i, j))[~diagonal])
+            return result
+        return self.row(key)
+
+    def to_dense(self, dtype=float):
+        """Строит плотную матрицу (numpy.ndarray)."""
+        dense = np.full((self.size, self.size), self.diagonal, dtype=dtype)
+        upper = np.triu_indices(self.size, 1)
+        values = self._read(slice(None))
+        dense[upper] = values
+        dense.T[upper] = values
+        return dense
+
+    def __array__(self, dtype=None, copy=None):
+        return self.to_dense(dtype or float)
+
+
+class IntegerMatrix:
+    """Плотная матрица целочисленных весов с особым значением для запрещённых переходов.
+
+    Используется для матриц uint16 из файла .tspm: элементы хранятся
+    отображением файла, а при чтении переводятся в float, значение missing
+    заменяется на inf. Поддерживаются те же обращения, что и у SymmetricMatrix.
+    """
+
+    def __init__(self, values, missing=UINT16_MISSING):
+        """
+        Аргументы:
+        values -- квадратный массив весов (numpy.ndarray или numpy.memmap)
+        missing -- значение, обозначающее запрещённый переход (int, по умолчанию 65535)
+        """
+        self.values = values
+        self.size = len(values)
+        self.missing = missing
+
+    @property
+    def shape(self):
+        return self.size, self.size
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def __len__(self):
+        return self.size
+
+    def _convert(self, values):
+        converted = np.asarray(values, dtype=float)
+        converted[np.asarray(values) == self.missing] = inf
+        return converted
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            return self._convert(self.values[key])[()]
+        return self._convert(self.values[key])
+
+    def row(self, i):
+        """Возвращает строку i как плотный массив (numpy.ndarray)."""
+        return self[i]
+
+    def to_dense(self, dtype=float):
+        """Строит плотную матрицу (numpy.ndarray)."""
+        return self._convert(self.values).astype(dtype, copy=False)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.to_dense(dtype or float)
+
+
+def _encode(matrix, dtype, packed):
+    """Преобразует матрицу в одномерный массив заданного типа для записи в файл."""
+    size = len(matrix)
+    if packed:
+        values = matrix[np.triu_indices(size, 1)]
+    else:
+        values = matrix.ravel()
+    if dtype == 'uint16':
+        finite = np.isfinite(values)
+        if (values[finite] < 0).any() or (values[finite] >= UINT16_MISSING).any() or \
+                (values[finite] != np.round(values[finite])).any():
+            raise ValueError(f"uint16 storage requires integer weights in [0, {UINT16_MISSING - 1}]")
+        values = np.where(finite, values, UINT16_MISSING).astype(np.uint16)
+    else:
+        encoded = values.astype(dtype)
+        if not np.array_equal(encoded, values, equal_nan=True):
+            raise ValueError(f"{dtype} storage would lose precision, use dtype='float64'")
+        values = encoded
+    return values
+
+
+def save_matrices(filename, matrices, metadata=None, dtype='float64', packed=None):
+    """
+    Сохраняет именованные матрицы в бинарный файл .tspm, который открывается через np.memmap без копирования.
+
+    Аргументы:
+    filename -- полное имя файла (str)
+    matrices -- словарь {имя: матрица затрат} (dict)
+    metadata -- произвольные данные, сериализуемые в JSON (dict, по умолчанию None)
+    dtype -- тип хранения: 'float32', 'float64' или 'uint16' для целых весов,
+             где 65535 обозначает INF (str, по умолчанию 'float64')
+    packed -- хранить симметричные матрицы только верхним треугольником (bool, по умолчанию
+              None — упаковывать все симметричные матрицы); упаковываются только матрицы
+              с однородной диагональю, остальные сохраняются целиком
+
+    Исключения:
+    ValueError -- если тип хранения не поддерживается, матрица не квадратная или
+                  веса не представимы в выбранном типе без потерь
+    """
+    if dtype not in STORAGE_DTYPES:
+        raise ValueError(f"Unsupported storage dtype: {dtype}. Supported dtypes are {', '.join(map(repr, STORAGE_DTYPES))}.")
+    entries = {}
+    blocks = []
+    offset = 0
+    for name, matrix in matrices.items():
+        matrix = np.asarray(matrix, dtype=float)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError(f"Matrix {name!r} must be square, got shape {matrix.shape}")
+        symmetric = is_symmetric(matrix)
+        pack = (symmetric if packed is None else packed and symmetric) and has_uniform_diagonal(matrix)
+        values = _encode(matrix, dtype, pack)
+        entries[name] = {
+            'size': len(matrix),
+            'symmetric': bool(symmetric),
+            'packed': bool(pack),
+            'dtype': dtype,
+            'diagonal': None if not len(matrix) or np.isinf(matrix[0, 0]) else float(matrix[0, 0]),
+            'offset': offset,
+            'nbytes': values.nbytes,
+        }
+        blocks.append(values)
+        offset += -(-values.nbytes // ALIGNMENT) * ALIGNMENT
+
+    header = json.dumps({'version': 1, 'metadata': metadata or {}, 'matrices': entries}).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+    with open(filename, 'wb') as file:
+        file.write(MAGIC)
+        file.write(struct.pack('<Q', len(header)))
+        file.write(header)
+        for values, entry in zip(blocks, entries.values()):
+            file.seek(data_start + entry['offset'])
+            file.write(values.tobytes())
+        file.truncate(data_start + offset)
+
+
+class MatrixStore:
+    """Файл .tspm, открытый для чтения: именованные матрицы отображаются в память через np.memmap.
+
+    Атрибуты:
+    metadata -- пользовательские данные файла (dict)
+    names -- имена матриц в порядке записи (list)
+    """
+
+    def __init__(self, filename):
+        """
+        Аргументы:
+        filename -- полное имя файла (str)
+
+        Исключения:
+        ValueError -- если файл не является файлом .tspm
+        """
+        with open(filename, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{filename} is not a .tspm matrix store")
+            header_length, = struct.unpack('<Q', file.read(8))
+            header = json.loads(file.read(header_length))
+        self.filename = filename
+        self.data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+        self.metadata = header['metadata']
+        self.entries = header['matrices']
+        self.names = list(self.entries)
+
+    def info(self, name):
+        """Возвращает описание матрицы: size, symmetric, packed, dtype (dict)."""
+        return {key: self.entries[name][key] for key in ('size', 'symmetric', 'packed', 'dtype')}
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, name):
+        """Возвращает матрицу без чтения данных в память.
+
+        Плотная матрица float32/float64 возвращается как numpy.memmap,
+        упакованная — как SymmetricMatrix, плотная uint16 — как IntegerMatrix.
+        """
+        if name not in self.entries:
+            raise KeyError(name)
+        entry = self.entries[name]
+        size = entry['size']
+        diagonal = inf if entry['diagonal'] is None else entry['diagonal']
+        length = size * (size - 1) // 2 if entry['packed'] else size * size
+        if length == 0:
+            values = np.zeros(0, dtype=entry['dtype'])
+        else:
+            values = np.memmap(self.filename, dtype=entry['dtype'], mode='r',
+                               offset=self.data_start + entry['offset'], shape=(length,))
+        missing = UINT16_MISSING if entry['dtype'] == 'uint16' else None
+        if entry['packed']:
+            return SymmetricMatrix(values, size, diagonal, missing)
+        values = values.reshape(size, size)
+        return IntegerMatrix(values, missing) if missing is not None else values
+
+
+def open_matrices(filename):
+    """Открывает файл .tspm для чтения (см. MatrixStore)."""
+    return MatrixStore(filename)
@@ -1,6 +1,163 @@
 import heapq
+import threading
+from queue import Queue
+from functools import partial
+from time import perf_counter
 import numpy as np
 from math import inf
+from local_search import improve_tour
+from matrix_storage import is_symmetric
+from tsp_cache import solution_key
+from tsp_large import tsp_large
+
+class SearchStats:
+    """Счётчики и таймеры поиска методом ветвей и границ.
+
+    Объект передаётся решателям параметром stats. Если он не передан, решатели
+    не выполняют ни подсчётов, ни замеров времени.
+
+    Поля:
+    nodes_expanded -- число развёрнутых узлов (int)
+    nodes_pruned -- число отсечённых узлов (int)
+    pruned_by -- отсечения по видам оценки: 'reduction' (хватило стоимости редукции),
+                 'mst', 'two_min_edges', 'one_tree' и 'frontier' (узел из очереди
+                 или подзадача, ставшие бесполезными после улучшения рекорда) (dict)
+    max_depth -- максимальная глубина развёрнутого узла (int)
+    reduction_time -- время ветвления и редукции матриц, секунды (float)
+    bound_time -- время вычисления нижних оценок, секунды (float)
+    incumbents -- число улучшений рекорда во время поиска (int)
+    initial_cost -- стоимость начального рекорда (float)
+    time_to_first_incumbent -- время от старта до первого найденного поиском маршрута, секунды (float или None)
+    elapsed -- общее время поиска, секунды (float)
+    """
+
+    BOUND_KINDS = ('reduction', 'mst', 'two_min_edges', 'one_tree', 'frontier')
+
+    def __init__(self, started=None):
+        self.nodes_expanded = 0
+        self.nodes_pruned = 0
+        self.pruned_by = dict.fromkeys(self.BOUND_KINDS, 0)
+        self.max_depth = 0
+        self.reduction_time = 0.0
+        self.bound_time = 0.0
+        self.incumbents = 0
+        self.initial_cost = inf
+        self.time_to_first_incumbent = None
+        self.elapsed = 0.0
+        self.started = perf_counter() if started is None else started
+        self.last_bound_kind = None
+
+    def expand(self, depth):
+        """Учитывает развёрнутый узел на глубине depth."""
+        self.nodes_expanded += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def prune(self, kind):
+        """Учитывает отсечённый узел с указанием вида оценки."""
+        self.nodes_pruned += 1
+        self.pruned_by[kind] += 1
+
+    def prune_child(self, new_cost, upper_bound):
+        """Учитывает отсечение потомка: по редукции, если её хватило, иначе по последней оценке."""
+        self.prune('reduction' if new_cost >= upper_bound else self.last_bound_kind)
+
+    def incumbent(self):
+        """Учитывает улучшение рекорда."""
+        self.incumbents += 1
+        if self.time_to_first_incumbent is None:
+            self.time_to_first_incumbent = perf_counter() - self.started
+
+    def finish(self):
+        """Фиксирует общее время поиска."""
+        self.elapsed = perf_counter() - self.started
+
+    def merge(self, other):
+        """Добавляет статистику другого поиска, например процесса-исполнителя."""
+        self.nodes_expanded += other.nodes_expanded
+        self.nodes_pruned += other.nodes_pruned
+        for kind, count in other.pruned_by.items():
+            self.pruned_by[kind] += count
+        self.max_depth = max(self.max_depth, other.max_depth)
+        self.reduction_time += other.reduction_time
+        self.bound_time += other.bound_time
+        self.incumbents += other.incumbents
+        if other.time_to_first_incumbent is not None:
+            first = other.started + other.time_to_first_incumbent - self.started
+            if self.time_to_first_incumbent is None or first < self.time_to_first_incumbent:
+                self.time_to_first_incumbent = first
+
+    def as_dict(self):
+        """Возвращает статистику в виде словаря."""
+        return {
+            'nodes_expanded': self.nodes_expanded,
+            'nodes_pruned': self.nodes_pruned,
+            'pruned_by': dict(self.pruned_by),
+            'max_depth': self.max_depth,
+            'reduction_time': self.reduction_time,
+            'bound_time': self.bound_time,
+            'incumbents': self.incumbents,
+            'initial_cost': self.initial_cost,
+            'time_to_first_incumbent': self.time_to_first_incumbent,
+            'elapsed': self.elapsed,
+        }
+
+class SearchBudget:
+    """Ограничения поиска по времени и числу узлов для режима «в любой момент» (anytime).
+
+    Решатель вызывает spend() перед разворачиванием каждого узла и
+    прекращает поиск, когда бюджет исчерпан, сообщая в lower_bound
+    глобальную нижнюю границу по всем неисследованным узлам. Каждый
+    улучшенный рекорд передаётся в on_incumbent.
+
+    Атрибуты:
+    nodes -- число узлов, на которые израсходован бюджет (int)
+    exhausted -- бюджет исчерпан или поиск отменён (bool)
+    lower_bound -- нижняя граница неисследованной части дерева (float, inf — если поиск завершён)
+    """
+
+    def __init__(self, time_limit=None, max_nodes=None, on_incumbent=None):
+        """
+        Аргументы:
+        time_limit -- лимит времени поиска, секунды (float, по умолчанию None — без лимита)
+        max_nodes -- лимит развёрнутых узлов (int, по умолчанию None — без лимита)
+        on_incumbent -- функция, получающая копию каждого нового рекорда {'cost', 'path'}
+                        (callable, по умолчанию None)
+        """
+        self.deadline = perf_counter() + time_limit if time_limit is not None else None
+        self.max_nodes = max_nodes
+        self.on_incumbent = on_incumbent
+        self.nodes = 0
+        self.exhausted = False
+        self.lower_bound = inf
+
+    def spend(self):
+        """Расходует бюджет на один узел и возвращает True, если поиск нужно прекратить."""
+        if not self.exhausted:
+            self.nodes += 1
+            if self.max_nodes is not None and self.nodes > self.max_nodes:
+                self.exhausted = True
+            elif self.deadline is not None and perf_counter() >= self.deadline:
+                self.exhausted = True
+        return self.exhausted
+
+    def cancel(self):
+        """Прекращает поиск при следующей проверке бюджета."""
+        self.exhausted = True
+
+    def improved(self, best):
+        """Сообщает о новом рекорде."""
+        if self.on_incumbent is not None:
+            self.on_incumbent({'cost': best['cost'], 'path': list(best['path'])})
+
+
+class BudgetExhausted(Exception):
+    """Прерывает рекурсивный поиск при исчерпании бюджета, собирая нижнюю границу неисследованных узлов."""
+
+    def __init__(self, lower_bound):
+        super().__init__(lower_bound)
+        self.lower_bound = lower_bound
+
 
 def reduce_cost_matrix(matrix, verbose=False):
     """Редуцирует матрицу затрат, вычитая минимальные значения строк и столбцов.
@@ -32,50 +189,381 @@ def reduce_cost_matrix(matrix, verbose=False):
     
     return reduced_matrix, np.sum(row_min) + np.sum(col_min)
 
+def reduce_cost_matrix_inplace(matrix, rows=None, cols=None, undo_log=None, verbose=False):
+    """Редуцирует матрицу затрат на месте, обрабатывая только указанные строки и столбцы.
+
+    Строки и столбцы, не перечисленные в rows и cols, считаются уже
+    редуцированными: их закэшированный минимум равен нулю, поэтому они не
+    пересчитываются. Для уже редуцированной матрицы, в которой запрещены
+    отдельные клетки, достаточно передать строки и столбцы, потерявшие свой
+    нулевой элемент, — результат совпадает с полной редукцией.
+
+    Аргументы:
+    matrix -- матрица затрат, изменяется на месте (numpy.ndarray)
+    rows -- строки для пересчёта минимумов (list, по умолчанию None — все строки)
+    cols -- столбцы для пересчёта минимумов (list, по умолчанию None — все столбцы)
+    undo_log -- журнал изменений для отката (list, по умолчанию None — без журнала)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+
+    Возвращает:
+    total_reduction -- сумма всех вычтенных минимумов (float)
+    """
+    rows = np.arange(len(matrix)) if rows is None else np.asarray(rows, dtype=int)
+    cols = np.arange(len(matrix)) if cols is None else np.asarray(cols, dtype=int)
+    row_min = []
+    col_min = []
+
+    # Строки (столбцы) выбираются одной выборкой, которая сразу становится записью
+    # журнала, и вычитаются одной векторной операцией. Минимумы обрабатываются
+    # списками: пересчитываемых строк обычно единицы, и вызовы numpy дороже самой работы.
+    if len(rows):
+        values = matrix[rows]
+        row_min = [0.0 if value == inf else value for value in values.min(axis=1).tolist()]
+        if any(row_min):
+            if undo_log is not None:
+                undo_log.append(('row', rows, values))
+            matrix[rows] = values - np.array(row_min)[:, None]
+
+    if len(cols):
+        values = matrix[:, cols]
+        col_min = [0.0 if value == inf else value for value in values.min(axis=0).tolist()]
+        if any(col_min):
+            if undo_log is not None:
+                undo_log.append(('col', cols, values))
+            matrix[:, cols] = values - np.array(col_min)
+
+    if verbose:
+        print("=== Редукция матрицы (на месте) ===")
+        print(f"Минимумы строк {rows.tolist()}: {row_min}")
+        print(f"Минимумы столбцов {cols.tolist()}: {col_min}")
+        print(f"Нижняя граница: {sum(row_min) + sum(col_min)}")
+
+    return sum(row_min) + sum(col_min)
+
+def vertex_mask(num_cities, vertices):
+    """Преобразует множество вершин в булеву маску.
+
+    Аргументы:
+    num_cities -- число городов (int)
+    vertices -- множество вершин (set) или булева маска (numpy.ndarray)
+
+    Возвращает:
+    mask -- булева маска вершин длины num_cities (numpy.ndarray)
+    """
+    if isinstance(vertices, np.ndarray) and vertices.dtype == bool:
+        return vertices
+    mask = np.zeros(num_cities, dtype=bool)
+    mask[list(vertices)] = True
+    return mask
+
+# Наибольший размер матрицы, на котором prim_dense работает на списках Python, а не на numpy
+PRIM_SCALAR_SIZE = 48
+
+def prim_dense(weights):
+    """Плотный алгоритм Прима за O(k²) на матрице весов k x k.
+
+    Дерево растёт из вершины 0; ключ вершины — минимальный вес ребра из дерева
+    в неё (weights[u][v] для u в дереве). При равных ключах выбирается вершина
+    с меньшим индексом.
+
+    У глубоких узлов дерева поиска вершин немного, и накладные расходы вызовов
+    numpy на каждой итерации дороже самой работы, поэтому матрицы размером до
+    PRIM_SCALAR_SIZE обрабатываются на списках Python. Оба варианта выбирают
+    вершины в одном порядке и дают одинаковый результат.
+
+    Аргументы:
+    weights -- матрица весов (numpy.ndarray)
+
+    Возвращает:
+    total_cost -- стоимость дерева, inf если граф несвязен (float)
+    parent -- родитель каждой вершины в дереве, -1 для корня (numpy.ndarray)
+    """
+    size = len(weights)
+    if size <= PRIM_SCALAR_SIZE:
+        total_cost, parent = prim_lists(weights.tolist())
+        return total_cost, np.array(parent)
+
+    parent = np.full(size, -1)
+    in_tree = np.zeros(size, dtype=bool)
+    in_tree[0] = True
+    key = weights[0].copy()
+    key[0] = inf
+    key_parent = np.zeros(size, dtype=int)
+    improved = np.empty(size, dtype=bool)
+    total_cost = 0.0
+    for _ in range(size - 1):
+        # Ключи вершин дерева равны inf, поэтому argmin выбирает только вершины вне дерева
+        v = int(key.argmin())
+        if key[v] == inf:
+            return inf, parent
+        total_cost += key[v]
+        in_tree[v] = True
+        parent[v] = key_parent[v]
+        key[v] = inf
+        np.less(weights[v], key, out=improved)
+        improved[in_tree] = False
+        np.copyto(key, weights[v], where=improved)
+        np.copyto(key_parent, v, where=improved)
+    return total_cost, parent
+
+def prim_lists(weights):
+    """Алгоритм Прима из prim_dense на списках Python для небольших матриц.
+
+    Аргументы:
+    weights -- матрица весов (list списков)
+
+    Возвращает:
+    total_cost -- стоимость дерева, inf если граф несвязен (float)
+    parent -- родитель каждой вершины в дереве, -1 для корня (list)
+    """
+    size = len(weights)
+    parent = [-1] * size
+    in_tree = [False] * size
+    in_tree[0] = True
+    key = list(weights[0])
+    key_parent = [0] * size
+    total_cost = 0.0
+    for _ in range(size - 1):
+        v = -1
+        best = inf
+        for u in range(size):
+            if key[u] < best and not in_tree[u]:
+                best = key[u]
+                v = u
+        if v < 0:
+            return inf, parent
+        total_cost += best
+        in_tree[v] = True
+        parent[v] = key_parent[v]
+        row = weights[v]
+        for u in range(size):
+            if row[u] < key[u] and not in_tree[u]:
+                key[u] = row[u]
+                key_parent[u] = v
+    return total_cost, parent
+
 def minimum_spanning_tree(matrix, vertices, verbose=False):
     """Вычисляет минимальное остовное дерево (MST) для заданного множества вершин.
     
     Аргументы:
     matrix -- матрица затрат (numpy.ndarray)
-    vertices -- множество вершин (set)
+    vertices -- множество вершин (set) или булева маска вершин (numpy.ndarray)
     verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
     
     Возвращает:
     total_cost -- стоимость минимального остовного дерева (float)
     """
-    if len(vertices) <= 1:
+    indices = vertex_mask(len(matrix), vertices).nonzero()[0]
+    if len(indices) <= 1:
         return 0.0
-    total_cost = 0.0
-    visited = set()
-    start = next(iter(vertices))
-    priority_queue = [(0.0, start)]
     
     if verbose:
-        print(f"=== Вычисление MST для вершин {vertices} ===")
+        print(f"=== Вычисление MST для вершин {indices.tolist()} ===")
     
-    while priority_queue:
-        weight, u = heapq.heappop(priority_queue)
-        if u in visited:
-            continue
-        total_cost += weight
-        visited.add(u)
-        for v in vertices - visited:
-            edge_weight = matrix[u][v]
-            if edge_weight != inf:
-                heapq.heappush(priority_queue, (edge_weight, v))
-                if verbose:
-                    print(f"Добавлено ребро {u} -> {v} с весом {edge_weight}")
+    total_cost, parent = prim_dense(matrix[indices][:, indices])
     
     if verbose:
+        for v, u in enumerate(parent):
+            if u >= 0:
+                print(f"Добавлено ребро {indices[u]} -> {indices[v]} с весом {matrix[indices[u]][indices[v]]}")
         print(f"MST оценка оставшихся вершин: {total_cost}")
     
-    return total_cost if len(visited) == len(vertices) else inf
+    return total_cost
+
+def one_tree_bound(matrix, source, target, vertices, upper_bound=inf, iterations=30, verbose=False):
+    """Оценивает снизу стоимость гамильтонова пути source -> ... -> target через вершины vertices
+    с помощью 1-дерева и лагранжевой релаксации Хелда–Карпа.
+
+    Концы source и target склеиваются в одну специальную вершину, и путь
+    превращается в цикл. Веса симметризуются как min(c_ij, c_ji), поэтому
+    оценка корректна и для несимметричных матриц. 1-дерево — MST на vertices
+    плюс два самых дешёвых ребра специальной вершины. Штрафы вершин
+    подбираются субградиентным методом так, чтобы степени стремились к 2.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray)
+    source -- начало пути (int)
+    target -- конец пути (int)
+    vertices -- промежуточные вершины пути (set) или булева маска (numpy.ndarray)
+    upper_bound -- известная верхняя граница, при достижении которой итерации прекращаются (float)
+    iterations -- число итераций субградиентного метода (int, по умолчанию 30)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+
+    Возвращает:
+    lower_bound -- нижняя граница стоимости пути (float)
+    """
+    indices = np.flatnonzero(vertex_mask(len(matrix), vertices))
+    size = len(indices)
+    if size == 0:
+        return matrix[source][target]
+    if size == 1:
+        return matrix[source][indices[0]] + matrix[indices[0]][target]
+
+    sub = matrix[np.ix_(indices, indices)]
+    weights = np.empty((size + 1, size + 1))
+    weights[:size, :size] = np.minimum(sub, sub.T)
+    weights[size, :size] = weights[:size, size] = np.minimum(matrix[source, indices], matrix[indices, target])
+    weights[size, size] = inf
+
+    penalties = np.zeros(size + 1)
+    best_bound = -inf
+    step_scale = 2.0
+    stall = 0
+    for iteration in range(iterations):
+        adjusted = weights + penalties[:, None] + penalties[None, :]
+        tree_cost, parent = prim_dense(adjusted[:size, :size])
+        if tree_cost == inf:
+            return inf
+        special = np.argpartition(adjusted[size, :size], 1)[:2]
+        bound = tree_cost + adjusted[size, special].sum() - 2 * penalties.sum()
+        if bound == inf:
+            return inf
+
+        if bound > best_bound + 1e-9:
+            best_bound = bound
+            stall = 0
+        else:
+            stall += 1
+            if stall >= 5:
+                step_scale /= 2
+                stall = 0
+
+        degrees = np.full(size + 1, 2)
+        degrees[:size] = np.bincount(parent[parent >= 0], minlength=size) + (parent >= 0)
+        degrees[special] += 1
+        gradient = degrees - 2
+        norm = gradient @ gradient
+        if verbose:
+            print(f"1-дерево, итерация {iteration}: оценка {bound}, отклонение степеней {norm}")
+        if norm == 0 or best_bound >= upper_bound:
+            break
+
+        target_bound = upper_bound if upper_bound < inf else best_bound + max(1.0, 0.05 * abs(best_bound))
+        penalties += step_scale * (target_bound - bound) / norm * gradient
+
+    return best_bound
+
+def apply_branch(matrix, current, next_city, num_visited, selected_edges, undo_log, verbose=False):
+    """Выполняет переход current -> next_city на редуцированной матрице на месте.
+
+    Запрещает соответствующие строку, столбец и обратные переходы, записывая
+    исходные значения в журнал, после чего доредуцирует только те строки и
+    столбцы, которые потеряли нулевой элемент.
+
+    Аргументы:
+    matrix -- редуцированная матрица родительского узла, изменяется на месте (numpy.ndarray)
+    current -- текущий город (int)
+    next_city -- следующий город (int)
+    num_visited -- число посещённых городов до перехода (int)
+    selected_edges -- выбранные ребра для предотвращения циклов (dict)
+    undo_log -- журнал изменений для отката (list)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+
+    Возвращает:
+    reduced_cost -- стоимость доредукции дочернего узла (float)
+    """
+    undo_log.append(('row', current, matrix[current].copy()))
+    dirty_cols = matrix[current] == 0.0
+    matrix[current] = inf
+
+    undo_log.append(('col', next_city, matrix[:, next_city].copy()))
+    dirty_rows = matrix[:, next_city] == 0.0
+    matrix[:, next_city] = inf
 
-def tsp_branch_and_bound(matrix, current, visited, current_cost, path, best, selected_edges, verbose=False, depth=0):
+    banned_cells = []
+    if num_visited + 1 < len(matrix):
+        banned_cells.append((next_city, 0))
+    if current in selected_edges:
+        banned_cells.append((next_city, selected_edges[current]))
+    for cell in banned_cells:
+        value = matrix[cell]
+        if value == 0:
+            dirty_rows[cell[0]] = True
+            dirty_cols[cell[1]] = True
+        undo_log.append(('cell', cell, value))
+        matrix[cell] = inf
+
+    dirty_rows[current] = False
+    dirty_cols[next_city] = False
+    return reduce_cost_matrix_inplace(matrix, dirty_rows.nonzero()[0], dirty_cols.nonzero()[0], undo_log, verbose)
+
+def undo_branch(matrix, undo_log, checkpoint):
+    """Откатывает изменения матрицы до заданной отметки журнала.
+
+    Восстанавливаются только затронутые строки, столбцы и клетки.
+
+    Аргументы:
+    matrix -- матрица, изменённая через apply_branch (numpy.ndarray)
+    undo_log -- журнал изменений (list)
+    checkpoint -- длина журнала, до которой выполняется откат (int)
+    """
+    while len(undo_log) > checkpoint:
+        kind, index, values = undo_log.pop()
+        if kind == 'row':
+            matrix[index] = values
+        elif kind == 'col':
+            matrix[:, index] = values
+        else:
+            matrix[index] = values
+
+def node_lower_bound(reduced_matrix, remaining_cities, new_cost, verbose=False, bound='mst', next_city=None, upper_bound=inf,
+                     stats=None):
+    """Оценивает нижнюю границу узла.
+
+    В режиме 'mst' используется меньшая из оценок: MST оставшихся городов или
+    сумма двух минимальных ребер. В режиме 'one_tree' оставшийся путь
+    next_city -> ... -> 0 оценивается 1-деревом с лагранжевыми штрафами.
+
+    Аргументы:
+    reduced_matrix -- редуцированная матрица узла (numpy.ndarray)
+    remaining_cities -- непосещённые города, кроме текущего (set или булева маска numpy.ndarray)
+    new_cost -- стоимость узла с учётом редукции (float)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+    bound -- тип оценки: 'mst' или 'one_tree' (str, по умолчанию 'mst')
+    next_city -- текущий город узла, нужен для 'one_tree' (int)
+    upper_bound -- стоимость лучшего найденного маршрута (float, по умолчанию inf)
+    stats -- статистика поиска: учитывает время оценки и вид оценки, давшей границу (SearchStats, по умолчанию None)
+
+    Возвращает:
+    lower_bound -- нижняя граница стоимости маршрута через узел (float)
+    """
+    if stats is not None:
+        started = perf_counter()
+    mask = vertex_mask(len(reduced_matrix), remaining_cities)
+    if bound == 'one_tree':
+        lower_bound = new_cost + one_tree_bound(reduced_matrix, next_city, 0, mask, upper_bound - new_cost, verbose=verbose)
+        kind = 'one_tree'
+    else:
+        mst_estimate = minimum_spanning_tree(reduced_matrix, mask, verbose) if mask.any() else 0
+
+        # Находим сумму двух минимальных ребер для оставшихся городов
+        min_edges_sum = np.sort(np.min(reduced_matrix[mask], axis=1))[:2].sum()
+
+        lower_bound = new_cost + min(mst_estimate, min_edges_sum)
+        kind = 'mst' if mst_estimate <= min_edges_sum else 'two_min_edges'
+
+    if stats is not None:
+        stats.bound_time += perf_counter() - started
+        stats.last_bound_kind = kind
+    return lower_bound
+
+def tsp_branch_and_bound(matrix, current, visited, current_cost, path, best, selected_edges, verbose=False, depth=0, undo_log=None, bound='mst',
+                         stats=None, symmetric=False, budget=None):
     """
     Рекурсивно решает задачу коммивояжера методом ветвей и границ.
     
-    matrix -- матрица затрат (numpy.ndarray)
+    Все узлы работают с одной общей матрицей: переходы применяются на месте,
+    а при возврате изменения откатываются по журналу.
+
+    Когда бюджет исчерпан, поиск прерывается исключением BudgetExhausted.
+    При подъёме по стеку каждый узел добавляет к его нижней границе оценки
+    ещё не рассмотренных потомков, поэтому на корне исключение содержит
+    нижнюю границу всей неисследованной части дерева. Для этих потомков
+    используется дешёвая оценка 'mst': их число на всех уровнях стека
+    порядка глубины, умноженной на n, и 1-дерево для каждого стоило бы
+    больше самого поиска с малым бюджетом.
+    
+    matrix -- редуцированная матрица затрат, изменяется на время поиска и восстанавливается (numpy.ndarray)
     current -- текущий город (int)
     visited -- множество посещённых городов (set)
     current_cost -- накопленная стоимость пути (float)
@@ -84,8 +572,15 @@ def tsp_branch_and_bound(matrix, current, visited, current_cost, path, best, sel
     selected_edges -- выбранные ребра для предотвращения циклов (dict)
     verbose -- флаг для вывода промежуточных результатов (bool)
     depth -- глубина рекурсии (int, по умолчанию 0)
+    undo_log -- общий журнал изменений матрицы (list, по умолчанию None — создаётся новый)
+    bound -- тип нижней оценки: 'mst' или 'one_tree' (str, по умолчанию 'mst')
+    stats -- статистика поиска (SearchStats, по умолчанию None — без подсчёта)
+    symmetric -- матрица симметрична, зеркальные маршруты отсекаются (bool, по умолчанию False)
+    budget -- ограничения поиска (SearchBudget, по умолчанию None — без ограничений)
     """
     num_cities = len(matrix)
+    if stats is not None:
+        stats.expand(depth)
 
     # Если все города посещены, пытаемся вернуться в начальный город
     if len(visited) == num_cities:
@@ -96,6 +591,10 @@ def tsp_branch_and_bound(matrix, current, visited, current_cost, path, best, sel
         if total_cost < best['cost']:
             best['cost'] = total_cost
             best['path'] = path + [0]
+            if stats is not None:
+                stats.incumbent()
+            if budget is not None:
+                budget.improved(best)
         if verbose:
             print(f"Глубина={depth} ✅ Найден полный путь {path + [0]} с общей стоимостью {total_cost}")
         return
@@ -103,93 +602,565 @@ def tsp_branch_and_bound(matrix, current, visited, current_cost, path, best, sel
     # Формируем список кандидатов с сортировкой по стоимости перехода
     candidates = sorted(
         [city for city in range(num_cities) 
-         if city not in visited and matrix[current][city] != inf],
+         if city not in visited and matrix[current][city] != inf
+         and not (symmetric and best['cost'] < inf and city == 2 and 1 not in visited)],
         key=lambda city: matrix[current][city]
     )
     if verbose:
         print(f"Глубина={depth}  Рассматриваем кандидатов из города {current}: {candidates}")
 
-    for next_city in candidates:
+    if undo_log is None:
+        undo_log = []
+
+    for index, next_city in enumerate(candidates):
         cost_to_next = matrix[current][next_city]
 
-        # Создаем новую матрицу и модифицируем её для текущего перехода
-        new_matrix = matrix.copy()
-        new_matrix[current, :] = inf
-        new_matrix[:, next_city] = inf
-        if len(visited) + 1 < num_cities:
-            new_matrix[next_city][0] = inf
-        if current in selected_edges:
-            prev_city = selected_edges[current]
-            new_matrix[next_city][prev_city] = inf
+        # Модифицируем общую матрицу для текущего перехода, запоминая изменения в журнале
+        checkpoint = len(undo_log)
+        if stats is not None:
+            started = perf_counter()
+        reduced_cost = apply_branch(matrix, current, next_city, len(visited), selected_edges, undo_log, verbose)
+        new_cost = current_cost + cost_to_next + reduced_cost
+        if stats is not None:
+            stats.reduction_time += perf_counter() - started
 
         # Копируем словарь выбранных ребер и обновляем его для текущего перехода
         new_selected_edges = selected_edges.copy()
         new_selected_edges[current] = next_city
 
-        # Выполняем редукцию матрицы, возвращается новая матрица и стоимость редукции
-        reduced_matrix, reduced_cost = reduce_cost_matrix(new_matrix, verbose)
-        new_cost = current_cost + cost_to_next + reduced_cost
-
-        # Оцениваем нижнюю границу, используя MST и сумму двух минимальных ребер
+        # Оцениваем нижнюю границу, используя MST и сумму двух минимальных ребер или 1-дерево
         remaining_cities = set(range(num_cities)) - visited - {next_city}
-        mst_estimate = minimum_spanning_tree(reduced_matrix, remaining_cities, verbose) if remaining_cities else 0
-
-        # Находим сумму двух минимальных ребер для оставшихся городов
-        min_edges_sum = sum(sorted([min(row[row != inf]) for i, row in enumerate(reduced_matrix) if i in remaining_cities])[:2])
-
-        lower_bound = new_cost + min(mst_estimate, min_edges_sum)
+        lower_bound = node_lower_bound(matrix, remaining_cities, new_cost, verbose, bound, next_city, best['cost'], stats)
 
         if verbose:
             print(f"Глубина={depth} 🔍 Рассматриваем путь {path + [next_city]} (стоимость: {new_cost}, нижняя граница: {lower_bound})")
 
         # Продолжаем рекурсию только если нижняя граница ниже текущего лучшего результата
         if lower_bound < best['cost']:
-            tsp_branch_and_bound(
-                reduced_matrix, next_city, visited | {next_city}, new_cost,
-                path + [next_city], best, new_selected_edges, verbose, depth + 1
-            )
+            try:
+                if budget is not None and budget.spend():
+                    raise BudgetExhausted(lower_bound)
+                tsp_branch_and_bound(
+                    matrix, next_city, visited | {next_city}, new_cost,
+                    path + [next_city], best, new_selected_edges, verbose, depth + 1, undo_log, bound, stats, symmetric,
+                    budget
+                )
+            except BudgetExhausted as exhausted:
+                undo_branch(matrix, undo_log, checkpoint)
+                pending_bound = pending_lower_bound(
+                    matrix, current, visited, current_cost, selected_edges, candidates[index + 1:], undo_log,
+                    'mst', best['cost']
+                )
+                exhausted.lower_bound = min(exhausted.lower_bound, pending_bound)
+                raise
+        elif stats is not None:
+            stats.prune_child(new_cost, best['cost'])
 
+        # Возвращаем матрицу к состоянию текущего узла
+        undo_branch(matrix, undo_log, checkpoint)
 
-def tsp_little_algorithm(matrix, verbose=False):
+
+def pending_lower_bound(matrix, current, visited, current_cost, selected_edges, cities, undo_log, bound='mst',
+                        upper_bound=inf):
+    """Возвращает наименьшую нижнюю границу потомков узла, соответствующих переходам в cities.
+
+    Аргументы:
+    matrix -- редуцированная матрица узла, после вызова не изменяется (numpy.ndarray)
+    current -- текущий город (int)
+    visited -- посещённые города (set)
+    current_cost -- накопленная стоимость пути (float)
+    selected_edges -- выбранные ребра пути (dict)
+    cities -- следующие города нерассмотренных потомков (list)
+    undo_log -- журнал изменений матрицы (list)
+    bound -- тип нижней оценки: 'mst' или 'one_tree' (str, по умолчанию 'mst')
+    upper_bound -- стоимость лучшего найденного маршрута (float, по умолчанию inf)
+
+    Возвращает:
+    lower_bound -- минимальная граница потомков или inf, если потомков нет (float)
+    """
+    num_cities = len(matrix)
+    lower_bound = inf
+    for next_city in cities:
+        checkpoint = len(undo_log)
+        new_cost = current_cost + matrix[current][next_city] + apply_branch(
+            matrix, current, next_city, len(visited), selected_edges, undo_log
+        )
+        remaining_cities = set(range(num_cities)) - visited - {next_city}
+        lower_bound = min(lower_bound, node_lower_bound(matrix, remaining_cities, new_cost, False, bound, next_city,
+                                                        upper_bound))
+        undo_branch(matrix, undo_log, checkpoint)
+    return lower_bound
+
+
+def replay_branch(matrix, path, trail, undo_log):
+    """Приводит общую матрицу к состоянию узла с заданным путём.
+
+    Откатывает переходы текущего пути до общего с path префикса и применяет
+    оставшиеся переходы path через apply_branch.
+
+    Аргументы:
+    matrix -- общая редуцированная матрица корня, изменяется на месте (numpy.ndarray)
+    path -- путь узла, начинающийся с города 0 (tuple)
+    trail -- применённый сейчас путь: список пар (город, отметка журнала) (list)
+    undo_log -- журнал изменений матрицы (list)
+    """
+    common = 1
+    while common < min(len(path), len(trail)) and trail[common][0] == path[common]:
+        common += 1
+    if common < len(trail):
+        undo_branch(matrix, undo_log, trail[common][1])
+        del trail[common:]
+    for depth in range(common, len(path)):
+        selected_edges = dict(zip(path[:depth - 1], path[1:depth]))
+        checkpoint = len(undo_log)
+        apply_branch(matrix, path[depth - 1], path[depth], depth, selected_edges, undo_log)
+        trail.append((path[depth], checkpoint))
+
+def tsp_best_first(matrix, verbose=False, max_frontier=100000, bound='mst', initial_solution=None, stats=None,
+                   symmetric=False, budget=None):
+    """
+    Итеративно решает задачу коммивояжера методом ветвей и границ с выбором
+    узла с наименьшей нижней границей (best-first).
+
+    Открытые узлы хранятся в куче в компактном виде (граница, стоимость, путь);
+    редуцированная матрица узла не хранится, а восстанавливается на общей
+    матрице повторным применением переходов пути (см. replay_branch). Переходы
+    общего с предыдущим узлом префикса пути не пересчитываются.
+
+    Если размер кучи превышает max_frontier, дочерние узлы перестают попадать
+    в кучу и обрабатываются поиском в глубину через явный стек, пока стек не
+    опустеет. Это ограничивает расход памяти и быстро даёт рекорды на больших
+    матрицах.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+    max_frontier -- максимальное число узлов в куче до перехода к поиску в глубину (int)
+    bound -- тип нижней оценки: 'mst' или 'one_tree' (str, по умолчанию 'mst')
+    initial_solution -- известный маршрут {'cost', 'path'}, задающий начальный рекорд (dict, по умолчанию None)
+    stats -- статистика поиска (SearchStats, по умолчанию None — без подсчёта)
+    symmetric -- матрица симметрична, зеркальные маршруты отсекаются (bool, по умолчанию False)
+    budget -- ограничения поиска; при исчерпании в budget.lower_bound записывается наименьшая
+              граница открытых узлов (SearchBudget, по умолчанию None — без ограничений)
+
+    Возвращает:
+    best_solution -- словарь с лучшим найденным путём и его стоимостью: {'cost': float, 'path': list}
+    """
+    num_cities = len(matrix)
+    best = dict(initial_solution) if initial_solution else {'cost': inf, 'path': []}
+    root_matrix, root_cost = reduce_cost_matrix(matrix, verbose)
+    trail = [(0, 0)]
+    undo_log = []
+
+    counter = 0
+    frontier = [(root_cost, 0, counter, root_cost, (0,))]
+    dive = []
+
+    if verbose:
+        print(f"🚀 Запуск best-first поиска (лимит кучи: {max_frontier})...")
+
+    while frontier or dive:
+        node_bound, _, _, cost, path = dive.pop() if dive else heapq.heappop(frontier)
+        if node_bound >= best['cost']:
+            if stats is not None:
+                stats.prune('frontier')
+            continue
+        if budget is not None and budget.spend():
+            budget.lower_bound = min([node_bound] + [node[0] for node in frontier] + [node[0] for node in dive])
+            if verbose:
+                print(f"⏱ Бюджет исчерпан, нижняя граница: {budget.lower_bound}")
+            break
+
+        if stats is not None:
+            started = perf_counter()
+        replay_branch(root_matrix, path, trail, undo_log)
+        current = path[-1]
+        if stats is not None:
+            stats.reduction_time += perf_counter() - started
+            stats.expand(len(path) - 1)
+
+        if len(path) == num_cities:
+            return_cost = root_matrix[current][0]
+            if return_cost == inf:
+                continue
+            total_cost = cost + return_cost
+            if total_cost < best['cost']:
+                best['cost'] = total_cost
+                best['path'] = list(path) + [0]
+                if stats is not None:
+                    stats.incumbent()
+                if budget is not None:
+                    budget.improved(best)
+                if verbose:
+                    print(f"✅ Найден полный путь {best['path']} с общей стоимостью {total_cost}")
+            continue
+
+        visited = vertex_mask(num_cities, path)
+        selected_edges = dict(zip(path[:-1], path[1:]))
+        children = []
+        for next_city in range(num_cities):
+            cost_to_next = root_matrix[current][next_city]
+            if visited[next_city] or cost_to_next == inf or (
+                    symmetric and best['cost'] < inf and next_city == 2 and not visited[1]):
+                continue
+            checkpoint = len(undo_log)
+            if stats is not None:
+                started = perf_counter()
+            new_cost = cost + cost_to_next + apply_branch(root_matrix, current, next_city, len(path), selected_edges, undo_log)
+            if stats is not None:
+                stats.reduction_time += perf_counter() - started
+            remaining_cities = ~visited
+            remaining_cities[next_city] = False
+            lower_bound = node_lower_bound(root_matrix, remaining_cities, new_cost, False, bound, next_city, best['cost'], stats)
+            undo_branch(root_matrix, undo_log, checkpoint)
+            if lower_bound < best['cost']:
+                counter += 1
+                children.append((lower_bound, -len(path), counter, new_cost, path + (next_city,)))
+            elif stats is not None:
+                stats.prune_child(new_cost, best['cost'])
+
+        if verbose:
+            print(f"Глубина={len(path) - 1} 🔍 Узел {list(path)} (граница: {node_bound}), "
+                  f"потомков: {len(children)}, в куче: {len(frontier)}, в стеке: {len(dive)}")
+
+        if dive or len(frontier) + len(children) > max_frontier:
+            # Память исчерпана: продолжаем поиск в глубину, лучший потомок извлекается первым
+            dive.extend(sorted(children, reverse=True))
+        else:
+            for child in children:
+                heapq.heappush(frontier, child)
+
+    return best
+
+
+def tsp_little_algorithm(matrix, verbose=False, strategy='dfs', max_frontier=100000, bound=None, workers=1,
+                         initial_solution=None, warm_start=None, stats=None, collect_stats=False, symmetric=None,
+                         time_limit=None, max_nodes=None, on_incumbent=None, budget=None):
     """
     Решает задачу коммивояжера с использованием алгоритма Литтла.
     
-    matrix -- матрица затрат (numpy.ndarray)
+    matrix -- матрица затрат (numpy.ndarray или SymmetricMatrix)
     verbose -- флаг для вывода промежуточных результатов (bool)
+    strategy -- стратегия обхода дерева поиска: 'dfs' (рекурсивный поиск в глубину)
+                или 'best_first' (итеративный поиск по наименьшей границе) (str, по умолчанию 'dfs')
+    max_frontier -- лимит узлов в куче для 'best_first', после которого поиск идёт в глубину (int)
+    bound -- тип нижней оценки: 'mst' (MST и два минимальных ребра) или
+             'one_tree' (1-дерево Хелда–Карпа, точнее, но дороже) (str, по умолчанию None —
+             'one_tree' для симметричной матрицы, иначе 'mst')
+    workers -- число процессов для поиска в глубину; больше 1 или None (все ядра)
+               включает параллельный режим tsp_parallel.tsp_little_parallel (int, по умолчанию 1)
+    initial_solution -- известный маршрут {'cost', 'path'}, например от 'nn+2opt', задающий
+                        начальный рекорд, чтобы отсечение работало с первого спуска (dict, по умолчанию None)
+    warm_start -- источник начального рекорда (см. warm_start_solution): True или 'nearest' —
+                  ближайший сосед, имя эвристического метода solve_tsp или готовый маршрут (по умолчанию None)
+    stats -- объект для накопления статистики поиска (SearchStats, по умолчанию None)
+    collect_stats -- вернуть статистику поиска в ключе 'stats' результата (bool, по умолчанию False);
+                     без stats и collect_stats поиск не тратит время на подсчёты
+    symmetric -- симметрична ли матрица (bool, по умолчанию None — определяется по матрице);
+                 маршрут симметричной матрицы и его обращение имеют одинаковую стоимость, а
+                 обращение меняет порядок любых двух городов, поэтому после появления первого
+                 рекорда рассматриваются только маршруты, в которых город 1 посещается раньше
+                 города 2 (до рекорда отсечение не применяется, чтобы не откладывать первый
+                 полный маршрут)
+    time_limit -- лимит времени поиска, секунды (float, по умолчанию None — без лимита)
+    max_nodes -- лимит развёрнутых узлов (int, по умолчанию None — без лимита)
+    on_incumbent -- функция, получающая каждый новый рекорд {'cost', 'path'}, включая
+                    начальный (callable, по умолчанию None)
+    budget -- готовый объект ограничений вместо time_limit, max_nodes и on_incumbent
+              (SearchBudget, по умолчанию None)
     
     Возвращает:
-    best_solution -- словарь с лучшим найденным путём и его стоимостью: {'cost': float, 'path': list}
+    best_solution -- словарь с лучшим найденным путём и его стоимостью: {'cost': float, 'path': list},
+                     при collect_stats=True также 'stats' — словарь SearchStats.as_dict();
+                     при заданных ограничениях также 'lower_bound' — глобальная нижняя граница,
+                     'gap' — относительный разрыв (cost - lower_bound) / cost и 'optimal' — доказана
+                     ли оптимальность найденного маршрута
+
+    Исключения:
+    ValueError -- если передан неподдерживаемый тип оценки или стратегия, либо ограничения
+                  заданы для параллельного поиска
     """
-    if verbose:
-        print("🚀 Запуск алгоритма Литтла...")
-    best_solution = {'cost': float('inf'), 'path': []}
-    reduced_matrix, initial_cost = reduce_cost_matrix(matrix, verbose)
-    tsp_branch_and_bound(reduced_matrix, 0, {0}, initial_cost, [0], best_solution, {}, verbose)
+    if symmetric is None:
+        symmetric = is_symmetric(matrix)
+    matrix = np.asarray(matrix, dtype=float)
+    if bound is None:
+        bound = 'one_tree' if symmetric else 'mst'
+    if bound not in ('mst', 'one_tree'):
+        raise ValueError(f"Unsupported bound: {bound}. Supported bounds are 'mst', 'one_tree'.")
+    if warm_start is not None and warm_start is not False:
+        seed = warm_start_solution(matrix, warm_start)
+        if initial_solution is None or seed['cost'] < initial_solution['cost']:
+            initial_solution = seed
+        if verbose:
+            print(f"🔥 Начальный рекорд: {initial_solution['path']}, стоимость: {initial_solution['cost']}")
+    if collect_stats and stats is None:
+        stats = SearchStats()
+    if stats is not None:
+        stats.initial_cost = initial_solution['cost'] if initial_solution else inf
+    if strategy not in ('dfs', 'best_first'):
+        raise ValueError(f"Unsupported search strategy: {strategy}. Supported strategies are 'dfs', 'best_first'.")
+    if strategy == 'best_first' and workers != 1:
+        raise ValueError("Parallel search supports only the 'dfs' strategy")
+    if budget is None and (time_limit is not None or max_nodes is not None or on_incumbent is not None):
+        budget = SearchBudget(time_limit, max_nodes, on_incumbent)
+    if budget is not None and workers != 1:
+        raise ValueError("Search budgets are not supported by the parallel search")
+    if budget is not None and initial_solution:
+        budget.improved(initial_solution)
+
+    if strategy == 'best_first':
+        best_solution = tsp_best_first(matrix, verbose, max_frontier, bound, initial_solution, stats, symmetric, budget)
+    elif workers != 1:
+        from tsp_parallel import tsp_little_parallel
+        best_solution = tsp_little_parallel(matrix, verbose, workers, bound=bound, initial_solution=initial_solution, stats=stats,
+                                            symmetric=symmetric)
+    else:
+        if verbose:
+            print("🚀 Запуск алгоритма Литтла...")
+        best_solution = dict(initial_solution) if initial_solution else {'cost': float('inf'), 'path': []}
+        reduced_matrix, initial_cost = reduce_cost_matrix(matrix, verbose)
+        try:
+            tsp_branch_and_bound(reduced_matrix, 0, {0}, initial_cost, [0], best_solution, {}, verbose, bound=bound,
+                                 stats=stats, symmetric=symmetric, budget=budget)
+        except BudgetExhausted as exhausted:
+            budget.lower_bound = exhausted.lower_bound
+            if verbose:
+                print(f"⏱ Бюджет исчерпан, нижняя граница: {exhausted.lower_bound}")
+
+    if budget is not None:
+        cost = best_solution['cost']
+        lower_bound = min(budget.lower_bound, cost)
+        best_solution['lower_bound'] = lower_bound
+        if lower_bound >= cost:
+            best_solution['gap'] = 0.0
+        else:
+            best_solution['gap'] = (cost - lower_bound) / cost if cost < inf else inf
+        best_solution['optimal'] = bool(lower_bound >= cost)
+    if stats is not None:
+        stats.finish()
+        if collect_stats:
+            best_solution['stats'] = stats.as_dict()
     return best_solution
 
 
+def tsp_little_anytime(matrix, time_limit=None, max_nodes=None, **options):
+    """
+    Решает задачу коммивояжера алгоритмом Литтла в режиме «в любой момент»,
+    выдавая рекорды по мере их нахождения.
+
+    Поиск выполняется в отдельном потоке; досрочное закрытие генератора
+    прекращает поиск при следующей проверке бюджета.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray)
+    time_limit -- лимит времени поиска, секунды (float, по умолчанию None — без лимита)
+    max_nodes -- лимит развёрнутых узлов (int, по умолчанию None — без лимита)
+    options -- остальные параметры tsp_little_algorithm, например strategy='best_first' или warm_start
+
+    Возвращает:
+    генератор словарей {'cost', 'path'} для каждого нового рекорда; последний элемент —
+    итоговый результат с ключами 'lower_bound', 'gap' и 'optimal'
+    """
+    updates = Queue()
+    budget = SearchBudget(time_limit, max_nodes, updates.put)
+    result = {}
+
+    def search():
+        try:
+            result['solution'] = tsp_little_algorithm(matrix, budget=budget, **options)
+        except Exception as error:
+            result['error'] = error
+        finally:
+            updates.put(None)
+
+    worker = threading.Thread(target=search, daemon=True)
+    worker.start()
+    try:
+        for incumbent in iter(updates.get, None):
+            yield incumbent
+        if 'error' in result:
+            raise result['error']
+        yield result['solution']
+    finally:
+        budget.cancel()
+        worker.join()
+
+
+def warm_start_solution(matrix, warm_start='nearest'):
+    """Строит начальный рекорд для метода ветвей и границ.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray)
+    warm_start -- True или 'nearest' (ближайший сосед), имя эвристического метода solve_tsp
+                  ('nn+2opt', 'nn+2opt+oropt') или маршрут — список городов, с повтором
+                  начального или без (по умолчанию 'nearest')
+
+    Возвращает:
+    solution -- маршрут, начинающийся и заканчивающийся в городе 0, и его стоимость (dict)
+
+    Исключения:
+    ValueError -- если метод не является эвристикой или маршрут не обходит все города
+    """
+    if warm_start is True:
+        warm_start = 'nearest'
+    if isinstance(warm_start, str):
+        if warm_start not in SOLVERS or warm_start in ('little', 'held_karp'):
+            raise ValueError(f"Unsupported warm start: {warm_start}. Use a heuristic method or a tour.")
+        return SOLVERS[warm_start](matrix)
+
+    tour = list(warm_start)
+    if len(tour) > 1 and tour[0] == tour[-1]:
+        tour = tour[:-1]
+    if sorted(tour) != list(range(len(matrix))):
+        raise ValueError("Warm start tour must visit every city exactly once")
+    start = tour.index(0)
+    path = tour[start:] + tour[:start] + [0]
+    total_cost = sum(matrix[path[i]][path[i + 1]] for i in range(len(tour)))
+    return {'cost': total_cost, 'path': path}
+
+
+def warm_start_report(matrix, warm_start='nearest', **options):
+    """Оценивает, сколько узлов дерева поиска экономит начальный рекорд.
+
+    Алгоритм Литтла запускается дважды — без начального рекорда и с ним — с
+    одинаковыми остальными параметрами.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray)
+    warm_start -- источник начального рекорда, как в tsp_little_algorithm (по умолчанию 'nearest')
+    options -- остальные параметры tsp_little_algorithm
+
+    Возвращает:
+    report -- словарь: стоимость решения и начального рекорда, число узлов
+              без рекорда и с ним, число и доля сэкономленных узлов (dict)
+    """
+    cold_stats = SearchStats()
+    warm_stats = SearchStats()
+    solution = tsp_little_algorithm(matrix, stats=cold_stats, **options)
+    tsp_little_algorithm(matrix, warm_start=warm_start, stats=warm_stats, **options)
+    saved = cold_stats.nodes_expanded - warm_stats.nodes_expanded
+    return {
+        'cost': solution['cost'],
+        'initial_cost': warm_stats.initial_cost,
+        'cold_nodes': cold_stats.nodes_expanded,
+        'warm_nodes': warm_stats.nodes_expanded,
+        'nodes_saved': saved,
+        'saved_ratio': saved / cold_stats.nodes_expanded if cold_stats.nodes_expanded else 0.0,
+    }
+
+
+def tsp_held_karp(matrix, verbose=False, dtype='float64'):
+    """Решает задачу коммивояжера динамическим программированием по подмножествам (Хелд–Карп).
+
+    Время работы O(n²·2ⁿ) не зависит от структуры матрицы, память O(n·2ⁿ),
+    поэтому метод подходит для n до ~22. Переходы между слоями подмножеств
+    одного размера векторизованы средствами numpy.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+    dtype -- тип хранения таблицы ДП: 'float64', 'float32' или 'int32' (str, по умолчанию 'float64');
+             'float32' и 'int32' вдвое сокращают расход памяти, 'int32' требует целых весов
+
+    Возвращает:
+    solution -- найденный путь и его стоимость (dict)
+
+    Исключения:
+    ValueError -- если передан неподдерживаемый dtype или нецелая матрица для 'int32'
+    """
+    if dtype not in ('float64', 'float32', 'int32'):
+        raise ValueError(f"Unsupported dtype: {dtype}. Supported types are 'float64', 'float32', 'int32'.")
+    matrix = np.asarray(matrix, dtype=float)
+    num_cities = len(matrix)
+    if num_cities == 1:
+        return {'cost': inf, 'path': []} if matrix[0][0] == inf else {'cost': float(matrix[0][0]), 'path': [0, 0]}
+
+    if dtype == 'int32':
+        finite = np.isfinite(matrix)
+        if not np.array_equal(matrix[finite], np.round(matrix[finite])):
+            raise ValueError("Matrix must contain integer weights for dtype 'int32'")
+        # Бесконечность заменяется большим значением, сумма двух таких значений не переполняет int32
+        big = np.iinfo(np.int32).max // 2
+        costs = np.where(finite, np.minimum(matrix, big), big).astype(np.int32)
+    else:
+        big = inf
+        costs = matrix.astype(dtype)
+
+    # Город 0 — начало маршрута; бит j маски соответствует городу j + 1
+    size = num_cities - 1
+    full = 1 << size
+    masks = np.arange(full, dtype=np.int64)
+    dp = np.full((full, size), big, dtype=costs.dtype)
+    parent = np.full((full, size), -1, dtype=np.int8 if size < 127 else np.int16)
+    dp[1 << np.arange(size), np.arange(size)] = costs[0, 1:]
+
+    popcount = np.zeros(full, dtype=np.int8)
+    for bit in range(size):
+        popcount += (masks >> bit) & 1
+    layers = masks[np.argsort(popcount, kind='stable')]
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(popcount, minlength=size + 1))))
+
+    inner = costs[1:, 1:]
+    for subset_size in range(2, size + 1):
+        layer = layers[bounds[subset_size]:bounds[subset_size + 1]]
+        for last in range(size):
+            selected = layer[(layer >> last) & 1 == 1]
+            candidates = dp[selected ^ (1 << last)] + inner[:, last]
+            best_prev = np.argmin(candidates, axis=1)
+            best_cost = candidates[np.arange(len(selected)), best_prev]
+            dp[selected, last] = np.minimum(best_cost, big) if dtype == 'int32' else best_cost
+            parent[selected, last] = best_prev
+        if verbose:
+            print(f"Слой подмножеств размера {subset_size}: {len(layer)} масок")
+
+    closing = dp[full - 1] + costs[1:, 0]
+    last = int(np.argmin(closing))
+    total_cost = float(closing[last])
+    if total_cost >= big:
+        return {'cost': inf, 'path': []}
+
+    # Восстанавливаем путь с конца по таблице предков
+    reversed_path = []
+    mask = full - 1
+    while last >= 0:
+        reversed_path.append(last + 1)
+        prev = int(parent[mask, last])
+        mask ^= 1 << last
+        last = prev
+    path = [0] + reversed_path[::-1] + [0]
+
+    if verbose:
+        print(f"🏁 Оптимальный путь найден: {path}, стоимость: {total_cost}")
+    return {'cost': total_cost, 'path': path}
+
+
 def tsp_nearest_neighbor(matrix, verbose=False):
     """Решает задачу коммивояжера с использованием алгоритма ближайшего соседа.
+
+    Строки матрицы читаются по одной, поэтому упакованная симметричная
+    матрица (SymmetricMatrix) не разворачивается в плотную.
     
     Аргументы:
-    matrix -- матрица затрат (numpy.ndarray)
+    matrix -- матрица затрат (numpy.ndarray или SymmetricMatrix)
     verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
     
     Возвращает:
     solution -- найденный путь и его стоимость (dict)
     """
     num_cities = len(matrix)
-    visited = {0}
+    visited = np.zeros(num_cities, dtype=bool)
+    visited[0] = True
     path = [0]
     total_cost = 0
     current_city = 0
-    while len(visited) < num_cities:
-        next_city = min((i for i in range(num_cities) if i not in visited), key=lambda i: matrix[current_city][i], default=None)
-        if next_city is None or matrix[current_city][next_city] == inf:
+    for _ in range(num_cities - 1):
+        row = np.where(visited, inf, matrix[current_city])
+        next_city = int(np.argmin(row))
+        if row[next_city] == inf:
             return {'cost': inf, 'path': []}
-        visited.add(next_city)
+        visited[next_city] = True
         path.append(next_city)
-        total_cost += matrix[current_city][next_city]
+        total_cost += row[next_city]
         current_city = next_city
     if matrix[current_city][0] == inf:
         return {'cost': inf, 'path': []}
@@ -199,15 +1170,62 @@ def tsp_nearest_neighbor(matrix, verbose=False):
         print(f"🏁 Оптимальный путь найден: {path}, стоимость: {total_cost}")
     return {'cost': total_cost, 'path': path}
 
-def solve_tsp(matrix, method='little', verbose=False):
+def tsp_local_search(matrix, verbose=False, moves=('2opt', 'oropt'), neighbors=10):
+    """Строит маршрут алгоритмом ближайшего соседа и улучшает его локальным поиском.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray или SymmetricMatrix)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+    moves -- ходы локального поиска: '2opt' и/или 'oropt' (tuple, по умолчанию оба)
+    neighbors -- размер списков ближайших соседей (int, по умолчанию 10)
+
+    Возвращает:
+    solution -- найденный путь и его стоимость (dict)
+    """
+    solution = improve_tour(matrix, tsp_nearest_neighbor(matrix)['path'], moves, neighbors, verbose)
+    if verbose:
+        print(f"🏁 Маршрут после локального поиска: {solution['path']}, стоимость: {solution['cost']}")
+    return solution
+
+def solve_tsp(matrix, method='little', verbose=False, cache=None, **options):
     """Решает задачу коммивояжера выбранным методом.
     
     Аргументы:
     matrix -- матрица затрат (numpy.ndarray)
-    method -- метод решения ('little' или 'nearest_neighbor') (str, по умолчанию 'little')
+    method -- метод решения ('little', 'held_karp', 'nearest', 'nn+2opt', 'nn+2opt+oropt' или 'large' —
+              эвристика для больших задач по спискам кандидатов, см. tsp_large) (str, по умолчанию 'little')
     verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+    cache -- кэш решений по хешу матрицы, метода и параметров; решения с лимитом времени,
+             collect_stats или внешними stats/budget/on_incumbent не кэшируются (ResultCache, по умолчанию None)
+    options -- дополнительные параметры метода, например strategy='best_first' для 'little'
     
     Возвращает:
     solution -- найденный путь и его стоимость (dict)
+    
+    Исключения:
+    ValueError -- если передан неподдерживаемый метод
     """
-    return tsp_little_algorithm(matrix, verbose) if method == 'little' else tsp_nearest_neighbor(matrix, verbose)
\ No newline at end of file
+    if method not in SOLVERS:
+        raise ValueError(f"Unsupported method: {method}. Supported methods are {', '.join(map(repr, SOLVERS))}.")
+    key = solution_key(matrix, method, options) if cache is not None else None
+    if key is not None:
+        solution = cache.get(key)
+        if solution is not None:
+            if verbose:
+                print(f"♻️ Решение методом {method} взято из кэша")
+            return solution
+    solution = SOLVERS[method](matrix, verbose, **options)
+    if key is not None:
+        cache.put(key, solution)
+    return solution
+
+
+SOLVERS = {
+    'little': tsp_little_algorithm,
+    'held_karp': tsp_held_karp,
+    'nearest': tsp_nearest_neighbor,
+    'nearest_neighbor': tsp_nearest_neighbor,
+    'nn+2opt': partial(tsp_local_search, moves=('2opt',)),
+    'nn+2opt+oropt': partial(tsp_local_search, moves=('2opt', 'oropt')),
+    'large': tsp_large,
+}
@@ -0,0 +1,213 @@
+import copy
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+import numpy as np
+from matrix_storage import IntegerMatrix, SymmetricMatrix
+
+# Версия формата ключа: увеличивается, когда меняются результаты методов,
+# чтобы записи, сохранённые старыми версиями, не использовались
+CACHE_VERSION = 2
+# Параметры, при которых результат зависит не только от матрицы и метода
+# (лимит времени, статистика поиска, внешние счётчики и обратные вызовы), — такие решения не кэшируются
+UNCACHEABLE_OPTIONS = ('stats', 'collect_stats', 'budget', 'on_incumbent', 'time_limit')
+CACHE_SUFFIX = '.pkl'
+
+
+def _update_array(digest, array):
+    """Добавляет в хеш массив: тип, форму и буфер данных без преобразования и копирования."""
+    if array.dtype.kind not in 'biuf':
+        array = np.asarray(array, dtype=float)
+    digest.update(f'array{array.dtype.str}{array.shape}'.encode())
+    digest.update(np.ascontiguousarray(array).data)
+
+
+def _update_digest(digest, value):
+    """
+    Добавляет значение параметра в хеш; массивы хешируются по содержимому, а не по repr.
+    Упакованные и целочисленные матрицы (в том числе отображения файлов .tspm) хешируются
+    по хранимому массиву values, не разворачиваясь в плотную матрицу.
+    """
+    if isinstance(value, (SymmetricMatrix, IntegerMatrix)):
+        digest.update(f'{type(value).__name__}{value.size}:{getattr(value, "diagonal", None)}:{value.missing}'.encode())
+        _update_array(digest, value.values)
+    elif isinstance(value, np.ndarray):
+        _update_array(digest, value)
+    elif hasattr(value, '__array__') and not np.isscalar(value):
+        _update_array(digest, np.asarray(value))
+    elif isinstance(value, dict):
+        digest.update(b'dict')
+        for name in sorted(value):
+            digest.update(repr(name).encode())
+            _update_digest(digest, value[name])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f'{type(value).__name__}{len(value)}'.encode())
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+
+def solution_key(matrix, method, options):
+    """
+    Вычисляет ключ кэша: хеш BLAKE2b содержимого матрицы, метода и параметров.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray, SymmetricMatrix, IntegerMatrix или None)
+    method -- метод решения (str)
+    options -- параметры метода (dict)
+
+    Возвращает:
+    key -- шестнадцатеричный ключ или None, если решение с такими параметрами не кэшируется (str)
+    """
+    for name in UNCACHEABLE_OPTIONS:
+        value = options.get(name)
+        if value is not None and value is not False:
+            return None
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'v{CACHE_VERSION}:{method}:'.encode())
+    _update_digest(digest, matrix)
+    _update_digest(digest, options)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Кэш решений solve_tsp с вытеснением давно не использованных записей (LRU).
+
+    Записи хранятся в памяти и, если задан каталог, на диске — по файлу на
+    решение, поэтому кэш переживает перезапуск программы и может разделяться
+    между процессами. Файлы читаются через pickle: каталог должен быть
+    доверенным.
+
+    Атрибуты:
+    hits -- число попаданий (int)
+    disk_hits -- число попаданий, прочитанных с диска (int)
+    misses -- число промахов (int)
+    evictions -- число вытесненных записей (int)
+    """
+
+    def __init__(self, directory=None, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """
+        Аргументы:
+        directory -- каталог для хранения решений на диске (str, по умолчанию None — только в памяти)
+        max_entries -- наибольшее число записей в памяти (int, по умолчанию 1024)
+        max_bytes -- наибольший суммарный размер файлов на диске, байты (int, по умолчанию 64 МБ)
+
+        Исключения:
+        ValueError -- если лимиты не положительны
+        """
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache limits must be positive")
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.memory)
+
+    def _filename(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, key):
+        """Возвращает копию сохранённого решения или None при промахе."""
+        solution = self.memory.get(key)
+        if solution is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(solution)
+        if self.directory is not None:
+            filename = self._filename(key)
+            try:
+                with open(filename, 'rb') as file:
+                    solution = pickle.load(file)
+                os.utime(filename)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                solution = None
+            if solution is not None:
+                self._remember(key, solution)
+                self.hits += 1
+                self.disk_hits += 1
+                return copy.deepcopy(solution)
+        self.misses += 1
+        return None
+
+    def put(self, key, solution):
+        """Сохраняет решение в памяти и, если задан каталог, на диске."""
+        self._remember(key, copy.deepcopy(solution))
+        if self.directory is None:
+            return
+        filename = self._filename(key)
+        temporary = f'{filename}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            pickle.dump(solution, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, filename)
+        self._evict_disk()
+
+    def _remember(self, key, solution):
+        self.memory[key] = solution
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_entries(self):
+        """Возвращает файлы кэша на диске как список (время доступа, размер, имя)."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(CACHE_SUFFIX):
+                try:
+                    status = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, name))
+        return entries
+
+    def _evict_disk(self):
+        """Удаляет давно не использованные файлы, пока их суммарный размер превышает max_bytes."""
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        """Удаляет все записи из памяти и с диска; статистика сохраняется."""
+        self.memory.clear()
+        if self.directory is not None:
+            for _, _, name in self._disk_entries():
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        """
+        Возвращает статистику кэша.
+
+        Возвращает:
+        stats -- попадания, промахи, доля попаданий, вытеснения, число записей и размер на диске (dict)
+        """
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.memory),
+            'disk_bytes': sum(size for _, size, _ in self._disk_entries()) if self.directory is not None else 0,
+        }
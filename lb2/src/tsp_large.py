@@ -0,0 +1,335 @@
+import numpy as np
+from math import inf
+from local_search import optimize_tour
+
+# Штраф за запрещённый переход в функции стоимости: заменяет inf, чтобы разности стоимостей были определены
+MISSING_PENALTY = 1e15
+
+
+def point_cost(points):
+    """Возвращает функцию стоимости cost(a, b) — евклидово расстояние между точками.
+
+    Аргументы:
+    points -- координаты городов n x d (numpy.ndarray)
+
+    Возвращает:
+    cost -- функция cost(a, b) для массивов индексов (callable)
+    """
+    points = np.asarray(points, dtype=float)
+    if points.shape[1] == 2:
+        # Отдельные массивы координат избавляют от свёртки по оси на каждом вызове
+        x, y = np.ascontiguousarray(points.T)
+        return lambda a, b: np.hypot(x[a] - x[b], y[a] - y[b])
+    return lambda a, b: np.sqrt(np.square(points[a] - points[b]).sum(axis=-1))
+
+
+def lookup_cost(matrix):
+    """Возвращает функцию стоимости cost(a, b), читающую отдельные элементы матрицы.
+
+    Матрица не копируется, поэтому подходит отображение файла в память
+    (numpy.memmap, SymmetricMatrix, IntegerMatrix). Запрещённые переходы
+    заменяются штрафом MISSING_PENALTY.
+
+    Аргументы:
+    matrix -- матрица затрат с доступом matrix[a, b]
+
+    Возвращает:
+    cost -- функция cost(a, b) для массивов индексов (callable)
+    """
+    def cost(a, b):
+        values = np.asarray(matrix[a, b], dtype=float)
+        return np.where(np.isfinite(values), values, MISSING_PENALTY)
+    return cost
+
+
+def knn_points(points, k=10, chunk_size=256):
+    """Строит списки k ближайших соседей для точек на плоскости с помощью равномерной сетки.
+
+    Точки раскладываются по ячейкам так, чтобы в ячейке было в среднем
+    около k/2 точек. Соседи ищутся в квадрате ячеек радиуса r вокруг ячейки
+    точки; если k-й сосед дальше r ширин ячейки, квадрат расширяется,
+    поэтому результат совпадает с точным перебором. Память — O(n·k).
+
+    Аргументы:
+    points -- координаты городов n x 2 (numpy.ndarray)
+    k -- число соседей (int, по умолчанию 10)
+    chunk_size -- число точек ячейки, обрабатываемых одной матричной операцией (int, по умолчанию 256)
+
+    Возвращает:
+    neighbors -- индексы соседей n x k, упорядоченные по расстоянию (numpy.ndarray)
+    distances -- расстояния до соседей n x k (numpy.ndarray)
+    """
+    points = np.asarray(points, dtype=float)
+    num_cities = len(points)
+    k = max(1, min(k, num_cities - 1))
+    low = points.min(axis=0)
+    extent = max(float((points.max(axis=0) - low).max()), 1e-12)
+    cells_per_side = max(1, int(np.sqrt(num_cities / max(1.0, k / 2))))
+    cell_size = extent / cells_per_side
+    cell_xy = np.minimum(((points - low) / cell_size).astype(int), cells_per_side - 1)
+    cell_id = cell_xy[:, 0] * cells_per_side + cell_xy[:, 1]
+    order = np.argsort(cell_id, kind='stable')
+    starts = np.searchsorted(cell_id[order], np.arange(cells_per_side * cells_per_side + 1))
+
+    neighbors = np.empty((num_cities, k), dtype=np.int64)
+    distances = np.empty((num_cities, k))
+    for cell in np.unique(cell_id):
+        cell_members = order[starts[cell]:starts[cell + 1]]
+        cx, cy = divmod(int(cell), cells_per_side)
+        for chunk in range(0, len(cell_members), chunk_size):
+            _knn_cell(points, cell_members[chunk:chunk + chunk_size], cx, cy, cells_per_side, cell_size,
+                      order, starts, k, neighbors, distances)
+    return neighbors, distances
+
+
+def _knn_cell(points, members, cx, cy, cells_per_side, cell_size, order, starts, k, neighbors, distances):
+    """Находит соседей для точек members из ячейки (cx, cy), расширяя квадрат ячеек до точного ответа."""
+    radius = 1
+    while len(members):
+        xs = np.arange(max(0, cx - radius), min(cells_per_side, cx + radius + 1))
+        ys = np.arange(max(0, cy - radius), min(cells_per_side, cy + radius + 1))
+        block = (xs[:, None] * cells_per_side + ys[None, :]).ravel()
+        candidates = np.concatenate([order[starts[c]:starts[c + 1]] for c in block])
+        delta = points[members][:, None, :] - points[candidates][None, :, :]
+        block_distances = np.sqrt(np.square(delta).sum(axis=-1))
+        block_distances[members[:, None] == candidates[None, :]] = inf
+        covers_all = len(block) == cells_per_side * cells_per_side
+        if len(candidates) - 1 >= k:
+            nearest = np.argpartition(block_distances, k - 1, axis=1)[:, :k]
+            nearest_distances = np.take_along_axis(block_distances, nearest, axis=1)
+            sorted_order = np.argsort(nearest_distances, axis=1, kind='stable')
+            nearest = np.take_along_axis(nearest, sorted_order, axis=1)
+            nearest_distances = np.take_along_axis(nearest_distances, sorted_order, axis=1)
+            # Точки вне квадрата находятся не ближе radius * cell_size от любой точки ячейки
+            exact = covers_all | (nearest_distances[:, -1] <= radius * cell_size)
+            neighbors[members[exact]] = candidates[nearest[exact]]
+            distances[members[exact]] = nearest_distances[exact]
+            members = members[~exact]
+        radius += 1
+
+
+def knn_matrix(matrix, k=10, chunk_size=256):
+    """Строит списки k самых дешёвых исходящих переходов, читая матрицу порциями строк.
+
+    В памяти одновременно находятся только chunk_size строк, поэтому
+    подходит матрица, отображённая из файла и не помещающаяся в память.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray, numpy.memmap, SymmetricMatrix или IntegerMatrix)
+    k -- число соседей (int, по умолчанию 10)
+    chunk_size -- число строк в порции (int, по умолчанию 256)
+
+    Возвращает:
+    neighbors -- индексы соседей n x k, упорядоченные по стоимости (numpy.ndarray)
+    distances -- стоимости переходов к соседям n x k (numpy.ndarray)
+    """
+    num_cities = len(matrix)
+    k = max(1, min(k, num_cities - 1))
+    neighbors = np.empty((num_cities, k), dtype=np.int64)
+    distances = np.empty((num_cities, k))
+    for start in range(0, num_cities, chunk_size):
+        rows = np.arange(start, min(start + chunk_size, num_cities))
+        if isinstance(matrix, np.ndarray):
+            block = np.array(matrix[start:rows[-1] + 1], dtype=float)
+        else:
+            block = np.array([matrix[row] for row in rows], dtype=float)
+        block[np.arange(len(rows)), rows] = inf
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        nearest_costs = np.take_along_axis(block, nearest, axis=1)
+        sorted_order = np.argsort(nearest_costs, axis=1, kind='stable')
+        neighbors[rows] = np.take_along_axis(nearest, sorted_order, axis=1)
+        distances[rows] = np.take_along_axis(nearest_costs, sorted_order, axis=1)
+    return neighbors, distances
+
+
+def hilbert_order(points, order=16):
+    """Упорядочивает точки вдоль кривой Гильберта.
+
+    Соседние по кривой точки близки на плоскости, поэтому порядок обхода
+    по кривой — начальный маршрут за O(n log n).
+
+    Аргументы:
+    points -- координаты городов n x 2 (numpy.ndarray)
+    order -- порядок кривой: сетка 2^order x 2^order (int, по умолчанию 16)
+
+    Возвращает:
+    tour -- порядок обхода городов (numpy.ndarray)
+    """
+    points = np.asarray(points, dtype=float)
+    low = points.min(axis=0)
+    extent = max(float((points.max(axis=0) - low).max()), 1e-12)
+    side = 1 << order
+    x, y = (np.minimum((points - low) / extent * side, side - 1).astype(np.int64)).T
+    index = np.zeros(len(points), dtype=np.int64)
+    s = side >> 1
+    while s > 0:
+        rx = (x & s) > 0
+        ry = (y & s) > 0
+        index += s * s * ((3 * rx) ^ ry)
+        # Поворот квадранта, чтобы следующий уровень кривой шёл в нужном направлении
+        flip = ~ry & rx
+        x = np.where(flip, side - 1 - x, x)
+        y = np.where(flip, side - 1 - y, y)
+        swap = ~ry
+        x, y = np.where(swap, y, x), np.where(swap, x, y)
+        s >>= 1
+    return np.argsort(index, kind='stable')
+
+
+def greedy_edge_tour(cost, neighbors, distances):
+    """Строит маршрут жадным выбором ребер из списков кандидатов.
+
+    Ребра кандидатов рассматриваются по возрастанию стоимости и добавляются,
+    если оба конца имеют степень меньше 2 и ребро не замыкает цикл
+    (система непересекающихся множеств). Получившиеся цепочки соединяются
+    жадно: к концу текущей цепочки присоединяется цепочка с ближайшим концом.
+
+    Аргументы:
+    cost -- функция стоимости переходов cost(a, b) (callable)
+    neighbors -- индексы соседей n x k (numpy.ndarray)
+    distances -- стоимости переходов к соседям n x k (numpy.ndarray)
+
+    Возвращает:
+    tour -- порядок обхода городов (numpy.ndarray)
+    """
+    num_cities, k = neighbors.shape
+    first = np.repeat(np.arange(num_cities), k)
+    second = neighbors.ravel()
+    weights = distances.ravel()
+    keep = np.isfinite(weights) & (first != second)
+    low, high = np.minimum(first, second)[keep], np.maximum(first, second)[keep]
+    order = np.lexsort((high, low, weights[keep]))
+
+    parent = list(range(num_cities))
+    degree = [0] * num_cities
+    adjacency = [[] for _ in range(num_cities)]
+
+    def find(city):
+        while parent[city] != city:
+            parent[city] = parent[parent[city]]
+            city = parent[city]
+        return city
+
+    added = 0
+    previous = None
+    for a, b in zip(low[order].tolist(), high[order].tolist()):
+        if (a, b) == previous:
+            continue
+        previous = (a, b)
+        if degree[a] == 2 or degree[b] == 2:
+            continue
+        root_a, root_b = find(a), find(b)
+        if root_a == root_b:
+            continue
+        parent[root_a] = root_b
+        degree[a] += 1
+        degree[b] += 1
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+        added += 1
+        if added == num_cities - 1:
+            break
+
+    # Разворачиваем цепочки в последовательности городов
+    fragments = []
+    seen = np.zeros(num_cities, dtype=bool)
+    for start in range(num_cities):
+        if seen[start] or degree[start] == 2:
+            continue
+        fragment = [start]
+        seen[start] = True
+        previous, current = -1, start
+        while True:
+            following = [city for city in adjacency[current] if city != previous]
+            if not following:
+                break
+            previous, current = current, following[0]
+            fragment.append(current)
+            seen[current] = True
+        fragments.append(fragment)
+
+    heads = np.array([fragment[0] for fragment in fragments])
+    tails = np.array([fragment[-1] for fragment in fragments])
+    unused = np.ones(len(fragments), dtype=bool)
+    unused[0] = False
+    tour = list(fragments[0])
+    for _ in range(len(fragments) - 1):
+        candidates = np.flatnonzero(unused)
+        origin = np.full(len(candidates), tour[-1])
+        to_heads = cost(origin, heads[candidates])
+        to_tails = cost(origin, tails[candidates])
+        best_head, best_tail = int(np.argmin(to_heads)), int(np.argmin(to_tails))
+        if to_heads[best_head] <= to_tails[best_tail]:
+            chosen = candidates[best_head]
+            tour.extend(fragments[chosen])
+        else:
+            chosen = candidates[best_tail]
+            tour.extend(reversed(fragments[chosen]))
+        unused[chosen] = False
+    return np.array(tour)
+
+
+def tsp_large(matrix=None, verbose=False, points=None, k=10, construction='greedy', moves=('2opt', 'oropt')):
+    """
+    Эвристически решает задачу коммивояжера большой размерности по спискам кандидатов.
+
+    Для каждого города заранее строится список k ближайших соседей: по
+    координатам points через равномерную сетку или построчным чтением
+    матрицы. Начальный маршрут строится жадным выбором ребер из списков
+    ('greedy') или обходом вдоль кривой Гильберта ('hilbert', только для
+    points), затем улучшается ходами 2-opt и Or-opt, ограниченными теми же
+    списками. Дополнительная память — O(n·k): плотная матрица n x n не
+    строится, а заданная матрица может быть отображением файла в память.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray, numpy.memmap, SymmetricMatrix или IntegerMatrix;
+              по умолчанию None — используются points)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+    points -- координаты городов n x 2, стоимость — евклидово расстояние (numpy.ndarray, по умолчанию None)
+    k -- размер списков кандидатов (int, по умолчанию 10)
+    construction -- начальный маршрут: 'greedy' или 'hilbert' (str, по умолчанию 'greedy')
+    moves -- ходы локального поиска: '2opt' и/или 'oropt' (tuple, по умолчанию оба)
+
+    Возвращает:
+    solution -- найденный путь и его стоимость (dict)
+
+    Исключения:
+    ValueError -- если не заданы ни matrix, ни points, или построение не поддерживается
+    """
+    if construction not in ('greedy', 'hilbert'):
+        raise ValueError(f"Unsupported construction: {construction}. Supported constructions are 'greedy', 'hilbert'.")
+    if points is not None:
+        points = np.asarray(points, dtype=float)
+        num_cities = len(points)
+        cost = point_cost(points)
+    elif matrix is not None:
+        num_cities = len(matrix)
+        cost = lookup_cost(matrix)
+    else:
+        raise ValueError("Either matrix or points must be given")
+    if construction == 'hilbert' and points is None:
+        raise ValueError("The 'hilbert' construction requires points")
+    if num_cities == 0:
+        return {'cost': inf, 'path': []}
+    if num_cities == 1:
+        # Единственный город: маршрут — переход по диагонали матрицы (для точек он бесплатный)
+        origin = np.zeros(1, dtype=np.intp)
+        total_cost = float(cost(origin, origin)[0])
+        return {'cost': inf, 'path': []} if total_cost >= MISSING_PENALTY else {'cost': total_cost, 'path': [0, 0]}
+
+    neighbors, distances = knn_points(points, k) if points is not None else knn_matrix(matrix, k)
+    if verbose:
+        print(f"🚀 Списки кандидатов: {num_cities} городов по {neighbors.shape[1]} соседей")
+
+    tour = hilbert_order(points) if construction == 'hilbert' else greedy_edge_tour(cost, neighbors, distances)
+    if verbose:
+        print(f"Начальный маршрут ({construction}): стоимость {float(cost(tour, np.roll(tour, -1)).sum())}")
+
+    tour = optimize_tour(cost, tour, neighbors, moves)
+    tour = np.roll(tour, -int(np.flatnonzero(tour == 0)[0]))
+    total_cost = float(cost(tour, np.roll(tour, -1)).sum())
+    if total_cost >= MISSING_PENALTY:
+        return {'cost': inf, 'path': []}
+    if verbose:
+        print(f"🏁 Маршрут после локального поиска: стоимость {total_cost}")
+    return {'cost': total_cost, 'path': tour.tolist() + [0]}
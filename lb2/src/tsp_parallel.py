@@ -0,0 +1,277 @@
+import os
+import multiprocessing
+import numpy as np
+from math import inf, ceil
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from tsp_algorithms import (
+    reduce_cost_matrix, apply_branch, undo_branch, replay_branch,
+    node_lower_bound, tsp_branch_and_bound, SearchStats, SOLVERS, solve_tsp
+)
+
+# Состояние процесса-исполнителя: общая редуцированная матрица корня и глобальный рекорд
+_worker_state = {}
+
+# Состояние процесса-исполнителя пакетного решения: разделяемая память с матрицами и параметры метода
+_batch_state = {}
+
+
+class SharedIncumbent(dict):
+    """Словарь лучшего решения, стоимость которого согласована между процессами.
+
+    Чтение best['cost'] возвращает минимум из локального рекорда и общего
+    значения в разделяемой памяти, поэтому каждый процесс отсекает ветви по
+    глобальному рекорду. Запись улучшенной стоимости публикует её остальным
+    процессам. Путь хранится только локально.
+    """
+
+    def __init__(self, shared_cost):
+        super().__init__(cost=inf, path=[])
+        self.shared_cost = shared_cost
+
+    def __getitem__(self, key):
+        if key == 'cost':
+            return min(dict.__getitem__(self, 'cost'), self.shared_cost.get_obj().value)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        dict.__setitem__(self, key, value)
+        if key == 'cost':
+            with self.shared_cost.get_lock():
+                if value < self.shared_cost.value:
+                    self.shared_cost.value = value
+
+
+def _init_worker(root_matrix, shared_cost, bound, started=None, symmetric=False):
+    """Инициализирует процесс-исполнитель: сохраняет матрицу корня, общий рекорд и момент старта поиска."""
+    _worker_state['matrix'] = root_matrix
+    _worker_state['trail'] = [(0, 0)]
+    _worker_state['undo_log'] = []
+    _worker_state['shared_cost'] = shared_cost
+    _worker_state['bound'] = bound
+    _worker_state['started'] = started
+    _worker_state['symmetric'] = symmetric
+
+
+def _solve_subproblem(lower_bound, cost, path):
+    """Решает подзадачу с фиксированным префиксом пути поиском в глубину.
+
+    Возвращает:
+    solution -- лучший маршрут, найденный в подзадаче, или {'cost': inf, 'path': []} (dict)
+    stats -- статистика поиска в подзадаче или None, если она не собирается (SearchStats)
+    """
+    matrix = _worker_state['matrix']
+    best = SharedIncumbent(_worker_state['shared_cost'])
+    started = _worker_state['started']
+    stats = SearchStats(started) if started is not None else None
+    if lower_bound >= best['cost']:
+        if stats is not None:
+            stats.prune('frontier')
+        return {'cost': inf, 'path': []}, stats
+
+    replay_branch(matrix, path, _worker_state['trail'], _worker_state['undo_log'])
+    tsp_branch_and_bound(
+        matrix, path[-1], set(path), cost, list(path), best, dict(zip(path[:-1], path[1:])),
+        depth=len(path) - 1, undo_log=_worker_state['undo_log'], bound=_worker_state['bound'], stats=stats,
+        symmetric=_worker_state['symmetric']
+    )
+    return {'cost': dict.__getitem__(best, 'cost'), 'path': best['path']}, stats
+
+
+def split_search_tree(root_matrix, root_cost, split_depth, bound='mst', symmetric=False):
+    """Разбивает верхние уровни дерева поиска на независимые подзадачи.
+
+    Аргументы:
+    root_matrix -- редуцированная матрица корня (numpy.ndarray), после вызова не изменяется
+    root_cost -- нижняя граница корня (float)
+    split_depth -- глубина, на которой узлы становятся подзадачами (int)
+    bound -- тип нижней оценки: 'mst' или 'one_tree' (str, по умолчанию 'mst')
+    symmetric -- матрица симметрична, город 1 посещается раньше города 2 (bool, по умолчанию False)
+
+    Возвращает:
+    subproblems -- список подзадач (нижняя граница, стоимость, путь), упорядоченный по границе (list)
+    """
+    num_cities = len(root_matrix)
+    split_depth = max(0, min(split_depth, num_cities - 2))
+    trail = [(0, 0)]
+    undo_log = []
+    level = [(root_cost, root_cost, (0,))]
+    for _ in range(split_depth):
+        next_level = []
+        for lower_bound, cost, path in level:
+            replay_branch(root_matrix, path, trail, undo_log)
+            current = path[-1]
+            visited = set(path)
+            selected_edges = dict(zip(path[:-1], path[1:]))
+            for next_city in range(num_cities):
+                cost_to_next = root_matrix[current][next_city]
+                if next_city in visited or cost_to_next == inf or (symmetric and next_city == 2 and 1 not in visited):
+                    continue
+                checkpoint = len(undo_log)
+                new_cost = cost + cost_to_next + apply_branch(root_matrix, current, next_city, len(path), selected_edges, undo_log)
+                remaining_cities = set(range(num_cities)) - visited - {next_city}
+                child_bound = node_lower_bound(root_matrix, remaining_cities, new_cost, False, bound, next_city)
+                undo_branch(root_matrix, undo_log, checkpoint)
+                if child_bound < inf:
+                    next_level.append((child_bound, new_cost, path + (next_city,)))
+        level = next_level
+    undo_branch(root_matrix, undo_log, 0)
+    return sorted(level, key=lambda node: node[0])
+
+
+def tsp_little_parallel(matrix, verbose=False, workers=None, split_depth=2, bound='mst', initial_solution=None,
+                        stats=None, symmetric=False):
+    """
+    Решает задачу коммивояжера алгоритмом Литтла на нескольких процессах.
+
+    Верхние split_depth уровней дерева поиска разворачиваются в основном
+    процессе, полученные подзадачи распределяются по пулу процессов. Лучшая
+    стоимость хранится в разделяемой памяти (multiprocessing.Value), и каждый
+    процесс отсекает ветви по глобальному рекорду. Стоимость результата
+    совпадает с последовательным решением; при нескольких оптимальных
+    маршрутах путь может отличаться.
+
+    Аргументы:
+    matrix -- матрица затрат (numpy.ndarray)
+    verbose -- флаг для вывода промежуточных результатов (bool, по умолчанию False)
+    workers -- число процессов (int, по умолчанию None — число ядер)
+    split_depth -- глубина разбиения дерева поиска на подзадачи (int, по умолчанию 2)
+    bound -- тип нижней оценки: 'mst' или 'one_tree' (str, по умолчанию 'mst')
+    initial_solution -- известный маршрут {'cost', 'path'}, задающий начальный рекорд (dict, по умолчанию None)
+    stats -- статистика поиска, объединяемая по всем процессам (SearchStats, по умолчанию None)
+    symmetric -- матрица симметрична, город 1 посещается раньше города 2 (bool, по умолчанию False)
+
+    Возвращает:
+    best_solution -- словарь с лучшим найденным путём и его стоимостью: {'cost': float, 'path': list}
+    """
+    workers = workers or os.cpu_count()
+    root_matrix, root_cost = reduce_cost_matrix(np.asarray(matrix, dtype=float))
+    subproblems = split_search_tree(root_matrix, root_cost, split_depth, bound, symmetric)
+    if verbose:
+        print(f"🚀 Параллельный алгоритм Литтла: {len(subproblems)} подзадач на {workers} процессах")
+
+    best_solution = dict(initial_solution) if initial_solution else {'cost': inf, 'path': []}
+    best_index = -1
+    shared_cost = multiprocessing.Value('d', best_solution['cost'])
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(root_matrix, shared_cost, bound,
+                                       stats.started if stats is not None else None, symmetric)) as executor:
+        futures = {executor.submit(_solve_subproblem, *subproblem): index
+                   for index, subproblem in enumerate(subproblems)}
+        for future in as_completed(futures):
+            solution, worker_stats = future.result()
+            index = futures[future]
+            if stats is not None:
+                stats.merge(worker_stats)
+            # При равной стоимости предпочитаем подзадачу, идущую раньше, для воспроизводимости
+            if solution['cost'] < best_solution['cost'] or (
+                    solution['cost'] == best_solution['cost'] and best_index > index):
+                best_solution, best_index = solution, index
+                if verbose:
+                    print(f"✅ Подзадача {index}: найден путь {solution['path']} со стоимостью {solution['cost']}")
+
+    return best_solution
+
+
+def _init_batch_worker(memory_name, offsets, sizes, method, options):
+    """Инициализирует процесс-исполнитель пакетного решения: подключает разделяемую память с матрицами."""
+    memory = shared_memory.SharedMemory(name=memory_name)
+    _batch_state['memory'] = memory
+    _batch_state['offsets'] = offsets
+    _batch_state['sizes'] = sizes
+    _batch_state['method'] = method
+    _batch_state['options'] = options
+
+
+def _batch_matrix(index):
+    """Возвращает матрицу index как представление разделяемой памяти только для чтения."""
+    size = _batch_state['sizes'][index]
+    matrix = np.ndarray((size, size), dtype=np.float64, buffer=_batch_state['memory'].buf,
+                        offset=_batch_state['offsets'][index])
+    matrix.flags.writeable = False
+    return matrix
+
+
+def _solve_batch_chunk(start, stop):
+    """Решает матрицы с номерами start..stop-1 и возвращает список пар (номер, решение)."""
+    return [(index, solve_tsp(_batch_matrix(index), _batch_state['method'], **_batch_state['options']))
+            for index in range(start, stop)]
+
+
+def solve_tsp_batch(matrices, method='little', workers=None, chunk_size=None, ordered=False, verbose=False,
+                    **options):
+    """
+    Решает задачу коммивояжера для набора матриц на пуле процессов и выдаёт
+    результаты по мере готовности.
+
+    Все матрицы один раз копируются в общий блок разделяемой памяти
+    (multiprocessing.shared_memory); процессы читают их оттуда без
+    сериализации, между процессами передаются только номера матриц и
+    решения. Соседние матрицы объединяются в порции по chunk_size, чтобы
+    накладные расходы на задачу не превышали время решения маленьких матриц.
+
+    Аргументы:
+    matrices -- матрицы затрат (итерируемый объект из numpy.ndarray)
+    method -- метод решения, как в solve_tsp (str, по умолчанию 'little')
+    workers -- число процессов (int, по умолчанию None — число ядер); при 1 решение
+               идёт в текущем процессе без пула и разделяемой памяти
+    chunk_size -- число матриц в одной задаче (int, по умолчанию None — примерно
+                  четыре порции на процесс)
+    ordered -- выдавать результаты в порядке matrices, а не по готовности (bool, по умолчанию False)
+    verbose -- флаг для вывода хода решения (bool, по умолчанию False)
+    options -- дополнительные параметры метода, передаются в solve_tsp
+
+    Возвращает:
+    генератор пар (номер матрицы, решение {'cost', 'path'})
+
+    Исключения:
+    ValueError -- если передан неподдерживаемый метод
+    """
+    if method not in SOLVERS:
+        raise ValueError(f"Unsupported method: {method}. Supported methods are {', '.join(map(repr, SOLVERS))}.")
+    matrices = [np.asarray(matrix, dtype=np.float64) for matrix in matrices]
+    workers = workers or os.cpu_count()
+    if workers == 1 or not matrices:
+        return ((index, solve_tsp(matrix, method, **options)) for index, matrix in enumerate(matrices))
+    return _stream_batch(matrices, method, workers, chunk_size, ordered, verbose, options)
+
+
+def _stream_batch(matrices, method, workers, chunk_size, ordered, verbose, options):
+    """Генератор результатов solve_tsp_batch для пула процессов.
+
+    При досрочном закрытии генератора ещё не начатые порции отменяются,
+    а разделяемая память освобождается.
+    """
+    sizes = [len(matrix) for matrix in matrices]
+    offsets = np.concatenate(([0], np.cumsum([matrix.nbytes for matrix in matrices]))).tolist()
+    chunk_size = chunk_size or max(1, ceil(len(matrices) / (workers * 4)))
+    memory = shared_memory.SharedMemory(create=True, size=max(1, offsets[-1]))
+    try:
+        for matrix, offset in zip(matrices, offsets):
+            np.ndarray(matrix.shape, dtype=np.float64, buffer=memory.buf, offset=offset)[:] = matrix
+        if verbose:
+            print(f"🚀 Пакетное решение: {len(matrices)} матриц, {workers} процессов, "
+                  f"порции по {chunk_size}, {offsets[-1]} байт в разделяемой памяти")
+
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                       initargs=(memory.name, offsets[:-1], sizes, method, options))
+        try:
+            futures = [executor.submit(_solve_batch_chunk, start, min(start + chunk_size, len(matrices)))
+                       for start in range(0, len(matrices), chunk_size)]
+            pending = {}
+            next_index = 0
+            for future in as_completed(futures):
+                for index, solution in future.result():
+                    if not ordered:
+                        yield index, solution
+                        continue
+                    # Результаты, пришедшие раньше очереди, ждут выдачи предыдущих
+                    pending[index] = solution
+                    while next_index in pending:
+                        yield next_index, pending.pop(next_index)
+                        next_index += 1
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    finally:
+        memory.close()
+        memory.unlink()
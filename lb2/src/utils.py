@@ -1,6 +1,7 @@
 import numpy as np
 from tabulate import tabulate
 from colorama import Fore, Style
+from matrix_storage import save_matrices, open_matrices
 
 INF = float('inf')
 
@@ -38,17 +39,20 @@ def generate_matrix(size, seed=None, symmetric=False):
     np.fill_diagonal(matrix, INF)
     return matrix
 
-def export_matrix(matrix, filename='export_matrix', file_type="txt"):
+def export_matrix(matrix, filename='export_matrix', file_type="txt", dtype='float64'):
     """
     Экспортирует матрицу в заданный файл в зависимости от формата.
     
     Аргументы:
       matrix -- матрица (numpy.ndarray)
       filename -- имя файла (str), без расширения
-      file_type -- тип файла для экспорта ("txt", "csv", "npy")
+      file_type -- тип файла для экспорта ("txt", "csv", "npy", "tspm" — бинарный формат
+                   для np.memmap, см. matrix_storage.save_matrices)
+      dtype -- тип хранения для "tspm": 'float32', 'float64' или 'uint16' (str, по умолчанию 'float64')
     
     Исключения:
-      ValueError -- если передан неподдерживаемый тип файла или matrix не является numpy.ndarray
+      ValueError -- если передан неподдерживаемый тип файла, matrix не является numpy.ndarray
+                    или значения не представимы в dtype без потерь
     """
     if not isinstance(matrix, np.ndarray):
         raise ValueError("Input matrix must be a numpy.ndarray")
@@ -61,21 +65,26 @@ def export_matrix(matrix, filename='export_matrix', file_type="txt"):
         np.savetxt(filename_with_extension, matrix, delimiter=",", fmt='%g')
     elif file_type == "npy":
         np.save(filename_with_extension, matrix)
+    elif file_type == "tspm":
+        save_matrices(filename_with_extension, {'matrix': matrix}, dtype=dtype)
     else:
-        raise ValueError(f"Unsupported file type: {file_type}. Supported types are 'txt', 'csv', 'json', 'npy'.")
+        raise ValueError(f"Unsupported file type: {file_type}. Supported types are 'txt', 'csv', 'json', 'npy', 'tspm'.")
     
     print(f"Matrix successfully exported to {filename_with_extension}")
 
-def load_matrix(filename, file_type="txt"):
+def load_matrix(filename, file_type="txt", name=None):
     """
     Загружает матрицу из файла в зависимости от формата.
     
     Аргументы:
       filename -- имя файла (str), без расширения
-      file_type -- тип файла для импорта ("txt", "csv", "json", "npy")
+      file_type -- тип файла для импорта ("txt", "csv", "json", "npy", "tspm")
+      name -- имя матрицы в файле "tspm" (str, по умолчанию None — первая матрица)
     
     Возвращает:
-      matrix -- загруженная матрица (numpy.ndarray)
+      matrix -- загруженная матрица (numpy.ndarray); для "tspm" — отображение файла в память
+                без копирования (numpy.memmap, SymmetricMatrix или IntegerMatrix),
+                которое решатели читают напрямую
     
     Исключения:
       ValueError -- если передан неподдерживаемый тип файла
@@ -88,8 +97,11 @@ def load_matrix(filename, file_type="txt"):
         matrix = np.loadtxt(filename_with_extension, delimiter=",")
     elif file_type == "npy":
         matrix = np.load(filename_with_extension)
+    elif file_type == "tspm":
+        store = open_matrices(filename_with_extension)
+        matrix = store[store.names[0] if name is None else name]
     else:
-        raise ValueError(f"Unsupported file type: {file_type}. Supported types are 'txt', 'csv', 'npy'.")
+        raise ValueError(f"Unsupported file type: {file_type}. Supported types are 'txt', 'csv', 'npy', 'tspm'.")
     
     return matrix
 
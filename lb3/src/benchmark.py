@@ -8,24 +8,28 @@ from levenshtein_calculator import LevenshteinCalculator
 from multiprocessing import Pool, cpu_count
 from functools import partial
 
-def generate_test_strings(length: int, complexity: float) -> Tuple[str, str]:
-    """Генерирует тестовые строки с заданной длиной и сложностью различий."""
+def generate_test_strings(length: int, complexity: float, rng=random,
+                          alphabet: str = string.ascii_letters) -> Tuple[str, str]:
+    """
+    Генерирует тестовые строки с заданной длиной и сложностью различий.
+    rng - генератор случайных чисел (random.Random с фиксированным seed для воспроизводимых данных).
+    """
     if length == 0:
         return "", ""
     
-    base = ''.join(random.choices(string.ascii_letters, k=length))
+    base = ''.join(rng.choices(alphabet, k=length))
     
     if complexity == 0:
         return base, base
     
     if complexity == 1:
-        return base, ''.join(random.choices(string.ascii_letters, k=length))
+        return base, ''.join(rng.choices(alphabet, k=length))
     
     changes = max(1, int(length * complexity))
-    indices = random.sample(range(length), changes)
+    indices = rng.sample(range(length), changes)
     target = list(base)
     for i in indices:
-        target[i] = random.choice(string.ascii_letters.replace(target[i], ''))
+        target[i] = rng.choice(alphabet.replace(target[i], ''))
     return base, ''.join(target)
 
 def run_single_test(args: Tuple[int, float]) -> Tuple[int, float]:
@@ -144,10 +148,58 @@ def run_length_tests(max_length: int = 5000, step: int = 250, repeats: int = 3):
     plt.savefig('levenshtein_performance.png', dpi=300)
     plt.show()
 
+def generate_dictionary(size: int, seed: int = 0) -> List[str]:
+    """Генерирует отсортированный словарь: группы слов с общими основами, как в реальных словарях."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < size:
+        stem = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 7)))
+        for _ in range(rng.randint(1, 12)):
+            words.add(stem + ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(0, 5))))
+    return sorted(words)[:size]
+
+def run_dictionary_tests(sizes: Tuple[int, ...] = (1000, 5000, 20000), query: str = 'interstellar'):
+    """Сравнивает поштучный calculate по словарю с calculate_many, переиспользующим общие префиксы."""
+    print("\nRunning dictionary tests...")
+    calculators = {'unit costs': LevenshteinCalculator(), 'special costs': LevenshteinCalculator('e', 0.5, 'a', 0.5)}
+    for size in sizes:
+        words = generate_dictionary(size)
+        for name, lev in calculators.items():
+            start = time.perf_counter()
+            expected = [lev.calculate(query, word) for word in words]
+            single_time = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            distances = lev.calculate_many(query, words)
+            many_time = (time.perf_counter() - start) * 1000
+            assert distances == expected
+            print(f"Words: {size}, {name}: calculate {single_time:.1f}ms, "
+                  f"calculate_many {many_time:.1f}ms, speedup {single_time / many_time:.1f}x")
+
+def run_bounded_tests(pairs: int = 2000, seed: int = 0):
+    """Сверяет calculate_bounded с calculate, в том числе при стоимостях, не кратных сотым."""
+    print("\nRunning bounded tests...")
+    rng = random.Random(seed)
+    calculators = {'unit costs': LevenshteinCalculator(), 'special costs': LevenshteinCalculator('*', 0.5, '#', 0.5),
+                   'fractional costs': LevenshteinCalculator('*', 0.115, '#', 0.335)}
+    for name, lev in calculators.items():
+        for _ in range(pairs):
+            s, t = (''.join(rng.choices('abc*#', k=rng.randint(0, 10))) for _ in range(2))
+            distance = lev.calculate(s, t)
+            for max_cost in (distance, distance - 0.01, rng.uniform(0, 6)):
+                expected = distance if distance <= max_cost else None
+                assert lev.calculate_bounded(s, t, max_cost) == expected, (name, s, t, max_cost)
+        print(f"Pairs: {pairs}, {name}: calculate_bounded matches calculate")
+
 if __name__ == "__main__":
     # Тесты с разной сложностью
     complexity_results = run_complexity_tests(repeats=5)
     plot_complexity_results(complexity_results)
     
     # Тест на увеличение длины строк
-    run_length_tests(max_length=5000, step=500)
\ No newline at end of file
+    run_length_tests(max_length=5000, step=500)
+    
+    # Словарь: один запрос против отсортированного списка слов
+    run_dictionary_tests()
+
+    # Расчет с порогом против полного расчета
+    run_bounded_tests()
\ No newline at end of file
@@ -0,0 +1,238 @@
+import argparse
+import json
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from tabulate import tabulate
+from benchmark import generate_test_strings
+from levenshtein_batch import distances_to
+from levenshtein_calculator import LevenshteinCalculator
+from levenshtein_stream import stream_distance
+
+# Семейства тестовых данных: алфавит и калькулятор. В 'special' исходные строки содержат особо
+# удаляемый символ, а целевые - особый заменитель, поэтому работает взвешенный DP
+FAMILIES = {
+    'unit': (string.ascii_letters, LevenshteinCalculator),
+    'special': (string.ascii_lowercase + '#*', lambda: LevenshteinCalculator('*', 0.5, '#', 0.5)),
+}
+
+# Режимы, замеряемые по одной паре строк за вызов
+PAIR_MODES: Dict[str, Callable] = {
+    'full': lambda calculator, s, t: calculator.calculate(s, t, mode='full'),
+    'linear': lambda calculator, s, t: calculator.calculate(s, t, mode='linear'),
+    'bit_parallel': lambda calculator, s, t: calculator.calculate(s, t, mode='bit_parallel'),
+    'auto': lambda calculator, s, t: calculator.calculate(s, t),
+    'bounded': lambda calculator, s, t: calculator.calculate_bounded(s, t, max(1, len(s) // 10)),
+    'edit_script': lambda calculator, s, t: calculator.edit_script(s, t),
+    'stream': lambda calculator, s, t: stream_distance([s[i:i + 256] for i in range(0, len(s), 256)], [t], calculator),
+}
+# Режимы, замеряемые по всему набору целей за вызов: первая исходная строка против всех целевых
+CORPUS_MODES: Dict[str, Callable] = {
+    'batch': lambda calculator, query, targets: distances_to(query, targets, calculator),
+    'many': lambda calculator, query, targets: calculator.calculate_many(query, targets),
+}
+MODES = tuple(PAIR_MODES) + tuple(CORPUS_MODES)
+# Наибольшая длина строк для режимов с полной матрицей
+MODE_MAX_LENGTH = {'full': 500}
+# Допустимый относительный рост метрик по сравнению с эталоном
+DEFAULT_THRESHOLDS = {'median_ms': 0.25, 'p95_ms': 0.5, 'peak_memory': 0.25}
+# Время ниже этого порога (миллисекунды) считается шумом и не сравнивается
+MIN_COMPARED_MS = 0.05
+
+
+def make_corpus(family: str, length: int, pairs: int, complexity: float, seed: int) -> List[Tuple[str, str]]:
+    """Воспроизводимый набор пар строк: один и тот же seed всегда дает одни и те же строки."""
+    alphabet, _ = FAMILIES[family]
+    rng = random.Random(f'{family}/{length}/{complexity}/{seed}')
+    return [generate_test_strings(length, complexity, rng, alphabet) for _ in range(pairs)]
+
+
+def _calls(mode: str, calculator: LevenshteinCalculator, corpus: List[Tuple[str, str]]) -> List[Callable]:
+    """Список вызовов без аргументов, каждый из которых дает один замер времени."""
+    if mode in CORPUS_MODES:
+        query, targets = corpus[0][0], [t for _, t in corpus]
+        return [lambda: CORPUS_MODES[mode](calculator, query, targets)]
+    return [lambda s=s, t=t: PAIR_MODES[mode](calculator, s, t) for s, t in corpus]
+
+
+def measure_mode(mode: str, calculator: LevenshteinCalculator, corpus: List[Tuple[str, str]],
+                 repeats: int = 5, warmup: int = 1) -> Dict:
+    """
+    Замеряет режим на наборе пар: warmup прогонов без замера, затем repeats прогонов,
+    в которых каждый вызов замеряется perf_counter. Пиковая память снимается отдельным
+    прогоном под tracemalloc, чтобы трассировка не искажала время.
+    """
+    calls = _calls(mode, calculator, corpus)
+    for _ in range(warmup):
+        for call in calls:
+            call()
+    samples = []
+    for _ in range(repeats):
+        for call in calls:
+            start = time.perf_counter()
+            call()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        for call in calls:
+            call()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'samples': len(samples),
+        'median_ms': float(np.median(samples)),
+        'p95_ms': float(np.percentile(samples, 95)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'mean_ms': float(np.mean(samples)),
+        'peak_memory': peak_memory,
+    }
+
+
+def run_suite(lengths: Sequence[int] = (50, 200, 1000), modes: Sequence[str] = MODES,
+              families: Sequence[str] = tuple(FAMILIES), pairs: int = 5, complexity: float = 0.3,
+              repeats: int = 5, warmup: int = 1, seed: int = 0, verbose: bool = True) -> Dict:
+    """
+    Запускает набор замеров для каждого сочетания (режим, семейство, длина).
+    'bit_parallel' пропускается для семейства 'special', где особые стоимости применяются,
+    режимы из MODE_MAX_LENGTH - для строк длиннее допустимого.
+    """
+    for mode in modes:
+        if mode not in MODES:
+            raise ValueError(f"Unsupported mode: {mode}. Supported modes are {', '.join(map(repr, MODES))}.")
+    for family in families:
+        if family not in FAMILIES:
+            raise ValueError(f"Unsupported family: {family}. Supported families are {', '.join(map(repr, FAMILIES))}.")
+
+    results = {}
+    for family in families:
+        calculator = FAMILIES[family][1]()
+        for length in lengths:
+            corpus = make_corpus(family, length, pairs, complexity, seed)
+            for mode in modes:
+                if (mode == 'bit_parallel' and family == 'special') or length > MODE_MAX_LENGTH.get(mode, length):
+                    continue
+                entry = measure_mode(mode, calculator, corpus, repeats, warmup)
+                results[f'{mode}/{family}/{length}'] = {'mode': mode, 'family': family, 'length': length, **entry}
+                if verbose:
+                    print(f"{mode:<13}{family:<9}length {length:<7}median {entry['median_ms']:.3f}ms, "
+                          f"p95 {entry['p95_ms']:.3f}ms, peak {entry['peak_memory'] / 1024:.1f}KB")
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'config': {'lengths': list(lengths), 'modes': list(modes), 'families': list(families), 'pairs': pairs,
+                   'complexity': complexity, 'repeats': repeats, 'warmup': warmup, 'seed': seed},
+        'results': results,
+    }
+
+
+def save_results(results: Dict, filename: str) -> None:
+    """Сохраняет результаты замеров в JSON."""
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(results, file, ensure_ascii=False, indent=2)
+
+
+def load_results(filename: str) -> Dict:
+    """Загружает результаты замеров из JSON."""
+    with open(filename, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare_results(baseline: Dict, current: Dict, thresholds: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """
+    Находит регрессии: метрики, выросшие относительно эталона больше порога.
+    Времена короче MIN_COMPARED_MS не сравниваются; замеры, которых нет в одном из файлов, пропускаются.
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    regressions = []
+    for key, new in current['results'].items():
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        for metric, threshold in thresholds.items():
+            if old[metric] <= 0:
+                continue
+            if metric.endswith('_ms') and max(old[metric], new[metric]) < MIN_COMPARED_MS:
+                continue
+            change = (new[metric] - old[metric]) / old[metric]
+            if change > threshold:
+                regressions.append({'case': key, 'metric': metric, 'baseline': old[metric],
+                                    'current': new[metric], 'change': change})
+    return regressions
+
+
+def print_results(results: Dict) -> None:
+    """Выводит замеры таблицей."""
+    rows = [[entry['mode'], entry['family'], entry['length'], entry['samples'], f"{entry['median_ms']:.3f}",
+             f"{entry['p95_ms']:.3f}", f"{entry['p99_ms']:.3f}", f"{entry['peak_memory'] / 1024:.1f}"]
+            for entry in results['results'].values()]
+    headers = ['Mode', 'Family', 'Length', 'Samples', 'Median, ms', 'p95, ms', 'p99, ms', 'Peak, KB']
+    print(tabulate(rows, headers=headers, tablefmt="grid"))
+
+
+def print_regressions(regressions: List[Dict]) -> None:
+    """Выводит найденные регрессии таблицей."""
+    if not regressions:
+        print("No regressions found")
+        return
+    rows = [[item['case'], item['metric'], f"{item['baseline']:.5g}", f"{item['current']:.5g}",
+             f"{item['change'] * 100:+.1f}%"] for item in regressions]
+    print(f"Regressions found: {len(regressions)}")
+    print(tabulate(rows, headers=['Case', 'Metric', 'Baseline', 'Current', 'Change'], tablefmt="grid"))
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Deterministic Levenshtein benchmark suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the benchmarks and write JSON')
+    run_parser.add_argument('--lengths', type=int, nargs='+', default=[50, 200, 1000])
+    run_parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES))
+    run_parser.add_argument('--families', nargs='+', default=list(FAMILIES), choices=list(FAMILIES))
+    run_parser.add_argument('--pairs', type=int, default=5)
+    run_parser.add_argument('--complexity', type=float, default=0.3)
+    run_parser.add_argument('--repeats', type=int, default=5)
+    run_parser.add_argument('--warmup', type=int, default=1)
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--output', default='levenshtein_benchmark.json')
+    run_parser.add_argument('--baseline', help='compare with a baseline JSON right away')
+    compare_parser = commands.add_parser('compare', help='compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    for parser_ in (run_parser, compare_parser):
+        for metric, default in DEFAULT_THRESHOLDS.items():
+            parser_.add_argument(f'--max-{metric.replace("_", "-")}', dest=metric, type=float, default=default,
+                                 help=f'allowed relative growth of {metric} (default {default})')
+    arguments = parser.parse_args(arguments)
+    thresholds = {metric: getattr(arguments, metric) for metric in DEFAULT_THRESHOLDS}
+
+    if arguments.command == 'run':
+        results = run_suite(arguments.lengths, arguments.modes, arguments.families, arguments.pairs,
+                            arguments.complexity, arguments.repeats, arguments.warmup, arguments.seed)
+        save_results(results, arguments.output)
+        print_results(results)
+        print(f"Results saved to {arguments.output}")
+        if arguments.baseline is None:
+            return 0
+        baseline = load_results(arguments.baseline)
+    else:
+        baseline = load_results(arguments.baseline)
+        results = load_results(arguments.current)
+    regressions = compare_results(baseline, results, thresholds)
+    print_regressions(regressions)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+from multiprocessing import Pool, cpu_count
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from levenshtein_calculator import LevenshteinCalculator
+
+# Заполнитель для выравнивания кандидатов по длине: не совпадает ни с одним символом Unicode
+PADDING = np.uint32(0xFFFFFFFF)
+
+# Состояние процессов пула для pairwise_distances
+_pool_state: Dict[str, object] = {}
+
+
+def encode(text: str) -> np.ndarray:
+    """Кодирует строку в массив кодов символов uint32."""
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def _wavefront_block(query: np.ndarray, del_costs: np.ndarray, col0: np.ndarray,
+                     block: np.ndarray, lengths: np.ndarray, replacer: Optional[int],
+                     replace_cost: int, unit: int) -> np.ndarray:
+    """
+    Расстояния от query до блока кандидатов одинаковой ширины обходом DP по антидиагоналям.
+    Клетки антидиагонали d = i + j зависят только от диагоналей d-1 и d-2, поэтому каждая
+    диагональ считается сразу для всех кандидатов блока векторными операциями numpy.
+    Стоимости - целые числа в единицах 1/scale (см. LevenshteinCalculator._scaled_costs),
+    поэтому расчет точный и округление клеток не нужно.
+    """
+    count, width = block.shape
+    n = len(query)
+    replace_costs = np.where(block == replacer, replace_cost, unit) if replacer is not None \
+        else np.full(block.shape, unit, dtype=np.int64)
+    result = np.empty(count, dtype=np.int64)
+    by_length: Dict[int, np.ndarray] = {}
+    for length in np.unique(lengths):
+        by_length[int(length)] = np.flatnonzero(lengths == length)
+
+    # Три буфера по очереди хранят диагонали d-2, d-1 и d; читаются только допустимые клетки диагоналей
+    diagonals = [np.empty((count, n + 1), dtype=np.int64) for _ in range(3)]
+    diagonals[0][:, 0] = 0
+    if 0 in by_length and n == 0:
+        result[by_length[0]] = 0
+    for d in range(1, n + width + 1):
+        prev2, prev, cur = diagonals[(d - 2) % 3], diagonals[(d - 1) % 3], diagonals[d % 3]
+        if d <= width:
+            cur[:, 0] = d * unit
+        if d <= n:
+            cur[:, d] = col0[d]
+        low, high = max(1, d - width), min(n, d - 1)
+        if low <= high:
+            # Символы кандидатов j - 1 = d - 1 - i для i = low..high
+            columns = slice(d - 1 - high, d - low)
+            targets = block[:, columns][:, ::-1]
+            sub = np.where(targets == query[low - 1:high], 0, replace_costs[:, columns][:, ::-1])
+            values = np.minimum(prev[:, low - 1:high] + del_costs[low - 1:high], prev[:, low:high + 1] + unit)
+            np.minimum(values, prev2[:, low - 1:high] + sub, out=values)
+            cur[:, low:high + 1] = values
+        finished = by_length.get(d - n)
+        if finished is not None:
+            result[finished] = cur[finished, n]
+    return result
+
+
+def distances_to(query: str, candidates: Sequence[str], calculator: Optional[LevenshteinCalculator] = None,
+                 chunk_size: int = 1024) -> np.ndarray:
+    """
+    Расстояния от query до каждого кандидата (query - исходная строка, кандидаты - целевые).
+    Кандидаты сортируются по длине и обрабатываются блоками по chunk_size, чтобы выравнивание
+    по длине почти не добавляло лишних клеток. Возвращает numpy.ndarray в порядке кандидатов;
+    значения совпадают с calculator.calculate(query, candidate).
+    Векторный расчет ведется в целых единицах 1/scale; если особые стоимости заданы точнее сотых
+    (масштаба нет), calculate() округляет каждую клетку, и кандидаты считаются им по одному.
+    """
+    calculator = calculator or LevenshteinCalculator()
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    result = np.empty(len(candidates))
+    if not len(candidates):
+        return result
+
+    scale, del_costs, replace_cost, unit = calculator._column_costs(query)
+    if scale is None:
+        result[:] = [calculator.calculate(query, candidate) for candidate in candidates]
+        return result
+
+    encoded_query = encode(query)
+    del_costs = np.array(del_costs, dtype=np.int64)
+    col0 = np.concatenate(([0], np.cumsum(del_costs)))
+    replacer = ord(calculator.special_replacer) if len(calculator.special_replacer) == 1 else None
+
+    lengths = np.array([len(candidate) for candidate in candidates])
+    order = np.argsort(lengths, kind='stable')
+    for start in range(0, len(order), chunk_size):
+        indices = order[start:start + chunk_size]
+        width = int(lengths[indices].max())
+        block = np.full((len(indices), width), PADDING, dtype=np.uint32)
+        for row, index in enumerate(indices):
+            block[row, :lengths[index]] = encode(candidates[index])
+        values = _wavefront_block(encoded_query, del_costs, col0, block, lengths[indices], replacer, replace_cost, unit)
+        result[indices] = [calculator._round_cost(value / scale) for value in values.tolist()]
+    return result
+
+
+def _init_pool_worker(strings: List[str], calculator: LevenshteinCalculator, chunk_size: int) -> None:
+    _pool_state['strings'] = strings
+    _pool_state['calculator'] = calculator
+    _pool_state['chunk_size'] = chunk_size
+
+
+def _pairwise_rows(rows: range) -> np.ndarray:
+    strings = _pool_state['strings']
+    return np.array([distances_to(strings[row], strings, _pool_state['calculator'], _pool_state['chunk_size'])
+                     for row in rows]).reshape(len(rows), len(strings))
+
+
+def pairwise_distances(strings: Sequence[str], calculator: Optional[LevenshteinCalculator] = None,
+                       workers: Optional[int] = None, chunk_size: int = 1024) -> np.ndarray:
+    """
+    Матрица расстояний: элемент [a][b] равен calculate(strings[a], strings[b]).
+    Матрица в общем случае несимметрична из-за особых стоимостей, поэтому считаются все строки.
+    При workers > 1 строки матрицы распределяются по процессам пула (по умолчанию - по числу ядер).
+    """
+    calculator = calculator or LevenshteinCalculator()
+    strings = list(strings)
+    workers = cpu_count() if workers is None else workers
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    size = len(strings)
+    if workers == 1 or size < 2:
+        _init_pool_worker(strings, calculator, chunk_size)
+        try:
+            return _pairwise_rows(range(size))
+        finally:
+            _pool_state.clear()
+
+    shard = max(1, -(-size // (workers * 4)))
+    shards = [range(start, min(start + shard, size)) for start in range(0, size, shard)]
+    with Pool(processes=workers, initializer=_init_pool_worker, initargs=(strings, calculator, chunk_size)) as pool:
+        return np.vstack(pool.map(_pairwise_rows, shards))
@@ -1,8 +1,35 @@
-from typing import List, Tuple, Optional
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional
 from colorama import init, Fore, Back, Style
 
 init(autoreset=True)
 
+# Режимы расчета: auto выбирает самый быстрый применимый алгоритм
+MODES = ('auto', 'full', 'linear', 'bit_parallel')
+# Множители для перевода дробных стоимостей в целые числа (0.5 -> 5/10, 0.25 -> 25/100)
+COST_SCALES = (1, 10, 100)
+# Подзадачи Хиршберга не больше этого числа клеток решаются полной матрицей
+SMALL_ALIGNMENT_CELLS = 4096
+
+
+@dataclass(frozen=True)
+class EditOperation:
+    """Операция редактирования: kind - 'Keep', 'Sub', 'Ins' или 'Del'."""
+    kind: str
+    source: Optional[str]
+    target: Optional[str]
+    cost: float
+
+    def __str__(self) -> str:
+        if self.kind == 'Keep':
+            return f"Keep '{self.source}'"
+        if self.kind == 'Sub':
+            return f"Sub '{self.source}'→'{self.target}'({self.cost})"
+        if self.kind == 'Ins':
+            return f"Ins '{self.target}'(1)"
+        return f"Del '{self.source}'({self.cost})"
+
 class LevenshteinCalculator:
     def __init__(self, 
                  special_replacer: str = '*', 
@@ -94,18 +121,24 @@ class LevenshteinCalculator:
         if verbose:
             print(Fore.YELLOW + "\n=== FILLING DP MATRIX ===")
 
+        # Стоимости удаления символов s и замены на символы t считаются один раз на вызов
+        del_costs = [self._deletion_cost(a) for a in s]
+        replace_costs = [self.special_replace_cost if b == self.special_replacer else 1.0 for b in t]
+
         for i in range(1, len(s) + 1):
+            deletion = del_costs[i-1]
             for j in range(1, len(t) + 1):
+                substitution = 0.0 if s[i-1] == t[j-1] else replace_costs[j-1]
                 # Вычисляем все возможные стоимости
-                del_cost = self._round_cost(dp[i-1][j] + self._deletion_cost(s[i-1]))
+                del_cost = self._round_cost(dp[i-1][j] + deletion)
                 ins_cost = self._round_cost(dp[i][j-1] + 1.0)
-                sub_cost = self._round_cost(dp[i-1][j-1] + self._substitution_cost(s[i-1], t[j-1]))
+                sub_cost = self._round_cost(dp[i-1][j-1] + substitution)
 
                 if verbose:
                     print(Fore.MAGENTA + f"\nCell [{i}][{j}] ('{s[i-1]}' → '{t[j-1]}'):")
-                    print(f"  Del: {dp[i-1][j]} + {self._deletion_cost(s[i-1])} = {del_cost}")
+                    print(f"  Del: {dp[i-1][j]} + {deletion} = {del_cost}")
                     print(f"  Ins: {dp[i][j-1]} + 1 = {ins_cost}")
-                    print(f"  Sub: {dp[i-1][j-1]} + {self._substitution_cost(s[i-1], t[j-1])} = {sub_cost}")
+                    print(f"  Sub: {dp[i-1][j-1]} + {substitution} = {sub_cost}")
 
                 # Находим минимальную стоимость
                 if sub_cost <= ins_cost and sub_cost <= del_cost:
@@ -113,14 +146,13 @@ class LevenshteinCalculator:
                     if s[i-1] == t[j-1]:
                         ops[i][j] = f"Keep '{s[i-1]}'"
                     else:
-                        cost = self._substitution_cost(s[i-1], t[j-1])
-                        ops[i][j] = f"Sub '{s[i-1]}'→'{t[j-1]}'({cost})"
+                        ops[i][j] = f"Sub '{s[i-1]}'→'{t[j-1]}'({substitution})"
                 elif ins_cost <= del_cost:
                     dp[i][j] = ins_cost
                     ops[i][j] = f"Ins '{t[j-1]}'(1)"
                 else:
                     dp[i][j] = del_cost
-                    ops[i][j] = f"Del '{s[i-1]}'({self._deletion_cost(s[i-1])})"
+                    ops[i][j] = f"Del '{s[i-1]}'({deletion})"
 
                 if verbose:
                     print(Fore.BLUE + f"  RESULT: {dp[i][j]} - {ops[i][j]}")
@@ -148,11 +180,274 @@ class LevenshteinCalculator:
         for step, op in enumerate(reversed(path), 1):
             print(Fore.CYAN + f"{step}. {op}")
 
-    def calculate(self, s: str, t: str, verbose: bool = False) -> float:
+    def _has_unit_costs(self, s: str, t: str) -> bool:
+        """
+        Проверяет, что для пары строк все операции стоят 1.
+        Особые стоимости применяются только при удалении особого символа из s
+        и при замене на особый заменитель в t.
+        """
+        return ((self.special_deletion_cost == 1.0 or self.special_deletion_symbol not in s) and
+                (self.special_replace_cost == 1.0 or self.special_replacer not in t))
+
+    def _bit_parallel_distance(self, s: str, t: str) -> int:
+        """
+        Расстояние Левенштейна с единичными стоимостями бит-параллельным алгоритмом Майерса (в формулировке Хиррё).
+        Столбец DP для более длинной строки хранится как битовые векторы приращений в целых числах Python,
+        поэтому один шаг по символу короткой строки обрабатывает весь столбец за несколько операций над словами.
+        """
+        pattern, text = (s, t) if len(s) >= len(t) else (t, s)
+        if not pattern:
+            return len(text)
+        m = len(pattern)
+        return self._bit_parallel_scan(self._pattern_masks(pattern), m, ((1 << m) - 1, 0, m), text)[2]
+
+    def _pattern_masks(self, pattern: str) -> Dict[str, int]:
+        """Битовые маски позиций каждого символа в pattern."""
+        peq: Dict[str, int] = {}
+        for i, ch in enumerate(pattern):
+            peq[ch] = peq.get(ch, 0) | (1 << i)
+        return peq
+
+    def _bit_parallel_scan(self, peq: Dict[str, int], m: int, state: Tuple[int, int, int], text: str,
+                           states: Optional[list] = None) -> Tuple[int, int, int]:
+        """
+        Продолжает алгоритм Майерса для шаблона длины m > 0 с состояния (pv, mv, score) по символам text
+        и возвращает новое состояние; начальное состояние - ((1 << m) - 1, 0, m).
+        Если передан список states, в него добавляется состояние после каждого символа.
+        """
+        mask = (1 << m) - 1
+        high = 1 << (m - 1)
+        pv, mv, score = state
+        for ch in text:
+            eq = peq.get(ch, 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & high:
+                score += 1
+            elif mh & high:
+                score -= 1
+            ph = ((ph << 1) | 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+            if states is not None:
+                states.append((pv, mv, score))
+        return pv, mv, score
+
+    def _cost_scale(self) -> Optional[int]:
+        """
+        Наименьший множитель из COST_SCALES, после умножения на который обе особые стоимости целые (0.5 -> 10).
+        None, если стоимости заданы точнее сотых: тогда расчет ведется в float с округлением каждой клетки.
+        """
+        for scale in COST_SCALES:
+            if all(abs(cost * scale - round(cost * scale)) < 1e-9
+                   for cost in (self.special_replace_cost, self.special_deletion_cost)):
+                return scale
+        return None
+
+    def _scaled_costs(self) -> Tuple[Optional[int], float, float, float]:
+        """Масштаб из _cost_scale, особые стоимости замены и удаления и единичная стоимость в единицах 1/scale."""
+        scale = self._cost_scale()
+        if scale is None:
+            return None, self.special_replace_cost, self.special_deletion_cost, 1.0
+        return scale, round(self.special_replace_cost * scale), round(self.special_deletion_cost * scale), scale
+
+    def _cost_tables(self, s: str, t: str) -> Tuple[Optional[int], list, list, float]:
+        """
+        Предвычисленные стоимости для пары строк: масштаб, стоимость удаления каждого символа s,
+        стоимость замены на каждый символ t (для несовпадающих символов) и стоимость вставки.
+        При масштабе scale все стоимости - целые числа в единицах 1/scale, и округление не нужно.
+        """
+        scale, replace_cost, deletion_cost, unit = self._scaled_costs()
+        del_costs = [deletion_cost if a == self.special_deletion_symbol else unit for a in s]
+        sub_costs = [replace_cost if b == self.special_replacer else unit for b in t]
+        return scale, del_costs, sub_costs, unit
+
+    def _column_costs(self, s: str) -> tuple:
+        """Стоимости для расчета по столбцам вдоль s: масштаб, удаление символов s, особая замена, единичная."""
+        scale, replace_cost, _, unit = self._scaled_costs()
+        return scale, self._cost_tables(s, '')[1], replace_cost, unit
+
+    def _first_column(self, s: str, costs: tuple) -> list:
+        """Столбец DP для пустой целевой строки: удаление префиксов s."""
+        scale, del_costs, _, _ = costs
+        column = [0] * (len(s) + 1) if scale else [0.0] * (len(s) + 1)
+        for i in range(1, len(s) + 1):
+            column[i] = column[i-1] + del_costs[i-1] if scale else round(column[i-1] + del_costs[i-1], 2)
+        return column
+
+    def _next_column(self, s: str, costs: tuple, prev: list, b: str) -> Tuple[list, float]:
+        """Столбец DP после добавления символа b к целевой строке и минимум этого столбца."""
+        scale, del_costs, replace_cost, unit = costs
+        sub_cost = replace_cost if b == self.special_replacer else unit
+        above = prev[0] + unit
+        column = [above]
+        diagonal = prev[0]
+        lowest = above
+        for i in range(1, len(s) + 1):
+            side = prev[i]
+            value = side + unit
+            candidate = above + del_costs[i-1]
+            if candidate < value:
+                value = candidate
+            candidate = diagonal if s[i-1] == b else diagonal + sub_cost
+            if candidate < value:
+                value = candidate
+            if scale is None:
+                value = round(value, 2)
+            column.append(value)
+            if value < lowest:
+                lowest = value
+            above = value
+            diagonal = side
+        return column, lowest
+
+    def _linear_distance(self, s: str, t: str) -> float:
+        """
+        Расчет только расстояния с двумя скользящими строками DP в буферах array.
+        Строки DP идут вдоль более короткой строки, поэтому память O(min(n, m)).
+        Стоимости и округление совпадают с полной матрицей.
+        """
+        n, m = len(s), len(t)
+        tables = self._cost_tables(s, t)
+        scale, del_costs, sub_costs, ins = tables
+        if n > m:
+            value = self._last_row(s, t, tables)[m]
+            return value / scale if scale else value
+
+        # Столбцы DP по символам t, в столбце - префиксы s
+        prev = array('q' if scale else 'd', [0]) * (n + 1)
+        for i in range(1, n + 1):
+            prev[i] = prev[i-1] + del_costs[i-1] if scale else round(prev[i-1] + del_costs[i-1], 2)
+        cur = array(prev.typecode, prev)
+        for b, sub_cost in zip(t, sub_costs):
+            above = cur[0] = prev[0] + ins
+            diagonal = prev[0]
+            for i in range(1, n + 1):
+                side = prev[i]
+                value = side + ins
+                candidate = above + del_costs[i-1]
+                if candidate < value:
+                    value = candidate
+                candidate = diagonal if s[i-1] == b else diagonal + sub_cost
+                if candidate < value:
+                    value = candidate
+                if scale is None:
+                    value = round(value, 2)
+                cur[i] = above = value
+                diagonal = side
+            prev, cur = cur, prev
+        return prev[n] / scale if scale else prev[n]
+
+    def _last_row(self, s: str, t: str, tables: Optional[tuple] = None) -> array:
+        """
+        Последняя строка DP матрицы (расстояния от s до всех префиксов t), память O(len(t)).
+        Значения в единицах 1/scale из _cost_tables (в float, если масштаб не найден).
+        """
+        scale, del_costs, sub_costs, ins = tables or self._cost_tables(s, t)
+        m = len(t)
+        prev = array('q' if scale else 'd', [0]) * (m + 1)
+        for j in range(1, m + 1):
+            prev[j] = prev[j-1] + ins
+        cur = array(prev.typecode, prev)
+        for a, del_cost in zip(s, del_costs):
+            left = prev[0] + del_cost
+            cur[0] = left = left if scale else round(left, 2)
+            diagonal = prev[0]
+            for j in range(1, m + 1):
+                up = prev[j]
+                value = up + del_cost
+                candidate = left + ins
+                if candidate < value:
+                    value = candidate
+                candidate = diagonal if a == t[j-1] else diagonal + sub_costs[j-1]
+                if candidate < value:
+                    value = candidate
+                if scale is None:
+                    value = round(value, 2)
+                cur[j] = left = value
+                diagonal = up
+            prev, cur = cur, prev
+        return prev
+
+    def _align_small(self, s: str, t: str, script: List[EditOperation]) -> None:
+        """Выравнивание полной DP матрицей с обратным ходом; используется для малых подзадач."""
+        n, m = len(s), len(t)
+        dp = [[0.0] * (m + 1) for _ in range(n + 1)]
+        for i in range(1, n + 1):
+            dp[i][0] = self._round_cost(dp[i-1][0] + self._deletion_cost(s[i-1]))
+        for j in range(1, m + 1):
+            dp[0][j] = self._round_cost(dp[0][j-1] + 1.0)
+        for i in range(1, n + 1):
+            for j in range(1, m + 1):
+                dp[i][j] = min(self._round_cost(dp[i-1][j] + self._deletion_cost(s[i-1])),
+                               self._round_cost(dp[i][j-1] + 1.0),
+                               self._round_cost(dp[i-1][j-1] + self._substitution_cost(s[i-1], t[j-1])))
+
+        # Обратный ход с тем же приоритетом операций, что и в _fill_dp_matrix: замена, вставка, удаление
+        path = []
+        i, j = n, m
+        while i > 0 or j > 0:
+            if i > 0 and j > 0:
+                cost = self._substitution_cost(s[i-1], t[j-1])
+                if self._round_cost(dp[i-1][j-1] + cost) == dp[i][j]:
+                    kind = 'Keep' if s[i-1] == t[j-1] else 'Sub'
+                    path.append(EditOperation(kind, s[i-1], t[j-1], cost))
+                    i, j = i - 1, j - 1
+                    continue
+            if j > 0 and (i == 0 or self._round_cost(dp[i][j-1] + 1.0) == dp[i][j]):
+                path.append(EditOperation('Ins', None, t[j-1], 1.0))
+                j -= 1
+            else:
+                path.append(EditOperation('Del', s[i-1], None, self._deletion_cost(s[i-1])))
+                i -= 1
+        script.extend(reversed(path))
+
+    def _hirschberg(self, s: str, t: str, script: List[EditOperation]) -> None:
+        """Рекурсивное деление Хиршберга: s делится пополам, точка разреза t ищется по прямой и обратной строкам DP."""
+        n, m = len(s), len(t)
+        if n <= 1 or (n + 1) * (m + 1) <= SMALL_ALIGNMENT_CELLS:
+            self._align_small(s, t, script)
+            return
+        middle = n // 2
+        forward = self._last_row(s[:middle], t)
+        backward = self._last_row(s[middle:][::-1], t[::-1])
+        split = min(range(m + 1), key=lambda j: forward[j] + backward[m - j])
+        self._hirschberg(s[:middle], t[:split], script)
+        self._hirschberg(s[middle:], t[split:], script)
+
+    def edit_script(self, s: str, t: str) -> List[EditOperation]:
+        """
+        Оптимальная последовательность операций (Keep/Sub/Ins/Del) с их стоимостями.
+        Вычисляется алгоритмом Хиршберга за память O(n + m) с учетом особых стоимостей замены и удаления;
+        сумма стоимостей операций равна calculate(s, t) (для стоимостей точнее сотых - с точностью
+        до округления клеток DP).
+        """
+        script: List[EditOperation] = []
+        self._hirschberg(s, t, script)
+        return script
+
+    def calculate(self, s: str, t: str, verbose: bool = False, mode: str = 'auto') -> float:
         """
         Расчет расстояния Левенштейна.
         Возвращает float для поддержки дробных стоимостей.
+
+        mode: 'full' - полная DP матрица; 'linear' - только расстояние, память O(min(n, m));
+        'bit_parallel' - алгоритм Майерса, только при единичных стоимостях;
+        'auto' - без verbose алгоритм Майерса, если особые стоимости не применяются к паре строк,
+        иначе 'linear'; с verbose - 'full'.
         """
+        if mode not in MODES:
+            raise ValueError(f"Unsupported mode: {mode}. Supported modes are {', '.join(map(repr, MODES))}.")
+        if mode == 'bit_parallel' and not self._has_unit_costs(s, t):
+            raise ValueError("Bit-parallel mode requires unit costs for the given strings")
+        if mode == 'bit_parallel' or (mode == 'auto' and not verbose and self._has_unit_costs(s, t)):
+            return float(self._bit_parallel_distance(s, t))
+        if mode == 'linear' or (mode == 'auto' and not verbose):
+            return self._round_cost(self._linear_distance(s, t))
+
         if not s and not t:
             return 0.0
             
@@ -170,4 +465,141 @@ class LevenshteinCalculator:
             self._print_matrix(dp, "FINAL MATRIX")
             self._trace_operations(ops, s, t, verbose)
 
-        return self._round_cost(dp[n][m])
\ No newline at end of file
+        return self._round_cost(dp[n][m])
+
+    def calculate_bounded(self, s: str, t: str, max_cost: float) -> Optional[float]:
+        """
+        Расстояние Левенштейна, если оно не превышает max_cost, иначе None.
+        Считаются только клетки диагональной полосы (Укконен): клетка отбрасывается, если ее стоимость
+        вместе с нижней оценкой оставшегося пути (разность длин остатков, покрываемая вставками
+        или самыми дешевыми удалениями) больше max_cost. Расчет прекращается, как только в строке
+        не остается ни одной клетки в пределах порога. Без масштаба клетки округляются и могут
+        оказаться меньше суммы стоимостей, поэтому оценка остатка не используется и клетка
+        отбрасывается только по своей стоимости (округленные клетки вдоль пути не убывают).
+        """
+        n, m = len(s), len(t)
+        scale, del_costs, sub_costs, ins = self._cost_tables(s, t)
+        limit = max_cost * (scale or 1) + 1e-9
+        min_del = min([ins] + del_costs)
+        inf = float('inf')
+
+        def remaining(i: int, j: int) -> float:
+            if scale is None:
+                return 0.0
+            gap = (m - j) - (n - i)
+            return gap * ins if gap >= 0 else -gap * min_del
+
+        if remaining(0, 0) > limit:
+            return None
+
+        prev = array('d', [inf]) * (m + 1)
+        cur = array('d', prev)
+        prev[0] = 0.0
+        lo = hi = 0
+        for j in range(1, m + 1):
+            value = prev[j-1] + ins
+            if value + remaining(0, j) > limit:
+                break
+            prev[j] = value
+            hi = j
+
+        for i in range(1, n + 1):
+            a = s[i-1]
+            del_cost = del_costs[i-1]
+            new_lo, new_hi = -1, -1
+            for j in range(lo, m + 1):
+                best = prev[j] + del_cost if j <= hi else inf
+                if j > lo:
+                    if j - 1 <= hi:
+                        sub = prev[j-1] if a == t[j-1] else prev[j-1] + sub_costs[j-1]
+                        if sub < best:
+                            best = sub
+                    if cur[j-1] + ins < best:
+                        best = cur[j-1] + ins
+                if scale is None:
+                    best = round(best, 2)
+                if best + remaining(i, j) > limit:
+                    cur[j] = inf
+                    if j > hi:
+                        break
+                    continue
+                cur[j] = best
+                if new_lo < 0:
+                    new_lo = j
+                new_hi = j
+            if new_lo < 0:
+                return None
+            # Очищаем клетки прошлой строки, чтобы использовать буфер повторно
+            for j in range(lo, min(hi + 2, m + 1)):
+                prev[j] = inf
+            for j in range(lo, new_lo):
+                cur[j] = inf
+            prev, cur = cur, prev
+            lo, hi = new_lo, new_hi
+
+        if hi != m:
+            return None
+        return self._round_cost(prev[m] / scale if scale else prev[m])
+
+    def calculate_many(self, s: str, targets: List[str]) -> List[float]:
+        """
+        Расстояния от s до каждой строки из targets (в порядке targets).
+        Цели обрабатываются в отсортированном порядке через IncrementalLevenshtein,
+        поэтому общие префиксы соседних целей считаются один раз.
+        """
+        incremental = IncrementalLevenshtein(s, self)
+        result = [0.0] * len(targets)
+        for index in sorted(range(len(targets)), key=targets.__getitem__):
+            result[index] = incremental.distance(targets[index])
+        return result
+
+
+class IncrementalLevenshtein:
+    """
+    Расстояния от одной исходной строки до последовательности целевых строк.
+    Хранит состояния DP для каждого префикса предыдущей цели и пересчитывает только
+    символы после общего префикса, поэтому лучше всего работает на отсортированных целях.
+    Если особое удаление не применяется к source, состояние на символ - битовые векторы
+    алгоритма Майерса, иначе - столбец DP. Цели с особым заменителем в режиме Майерса
+    считаются отдельно через calculate и не меняют сохраненные состояния.
+    """
+
+    def __init__(self, source: str, calculator: Optional[LevenshteinCalculator] = None):
+        self.calculator = calculator or LevenshteinCalculator()
+        self.source = source
+        self.previous = ''
+        self.reused = 0
+        self.computed = 0
+        self.bit_parallel = bool(source) and self.calculator._has_unit_costs(source, '')
+        if self.bit_parallel:
+            m = len(source)
+            self.peq = self.calculator._pattern_masks(source)
+            self.states = [((1 << m) - 1, 0, m)]
+        else:
+            self.costs = self.calculator._column_costs(source)
+            self.states = [self.calculator._first_column(source, self.costs)]
+
+    def distance(self, target: str) -> float:
+        """Расстояние от source до target; состояния общего префикса с предыдущей целью переиспользуются."""
+        calculator = self.calculator
+        if self.bit_parallel and not calculator._has_unit_costs(self.source, target):
+            return calculator.calculate(self.source, target)
+        common = 0
+        limit = min(len(target), len(self.previous))
+        while common < limit and target[common] == self.previous[common]:
+            common += 1
+        del self.states[common + 1:]
+        self.reused += common
+        self.computed += len(target) - common
+        self.previous = target
+
+        if self.bit_parallel:
+            calculator._bit_parallel_scan(self.peq, len(self.source), self.states[-1], target[common:], self.states)
+            return float(self.states[-1][2])
+        column = self.states[-1]
+        for b in target[common:]:
+            column = calculator._next_column(self.source, self.costs, column, b)[0]
+            self.states.append(column)
+        scale = self.costs[0]
+        value = column[len(self.source)]
+        return calculator._round_cost(value / scale if scale else value)
@@ -0,0 +1,143 @@
+import heapq
+import json
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from levenshtein_calculator import LevenshteinCalculator
+
+# Версия формата файла индекса
+INDEX_VERSION = 1
+
+
+class LevenshteinIndex:
+    """
+    Индекс для нечеткого поиска по словарю с метрикой LevenshteinCalculator.
+
+    Слова хранятся в префиксном дереве, развернутом в плоские массивы в порядке обхода в ширину:
+    дети узла v - узлы offsets[v]..offsets[v+1]-1. Запрос - исходная строка, слова словаря -
+    целевые, как в calculate(query, word). Обход дерева считает по одному столбцу DP на узел,
+    общие префиксы слов считаются один раз, а поддерево отсекается, когда минимум столбца
+    уже превышает порог. BK-дерево здесь не подходит: с особыми стоимостями расстояние
+    несимметрично, и неравенство треугольника для него не выполняется.
+    """
+
+    def __init__(self, words: Iterable[str], calculator: Optional[LevenshteinCalculator] = None):
+        self.calculator = calculator or LevenshteinCalculator()
+        self.words = sorted(set(words))
+        self.visited = 0
+
+        trie: Dict = {}
+        for index, word in enumerate(self.words):
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[None] = index
+
+        labels, offsets, terminals = [0], [], []
+        queue = [trie]
+        for node in queue:
+            offsets.append(len(labels))
+            terminals.append(node.get(None, -1))
+            for ch, child in node.items():
+                if ch is not None:
+                    labels.append(ord(ch))
+                    queue.append(child)
+        offsets.append(len(labels))
+        self._set_arrays(labels, offsets, terminals)
+
+    def _set_arrays(self, labels: List[int], offsets: List[int], terminals: List[int]) -> None:
+        self.labels = [chr(code) for code in labels]
+        self.offsets = offsets
+        self.terminals = terminals
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def _distance(self, value: float, scale: Optional[int]) -> float:
+        return self.calculator._round_cost(value / scale if scale else value)
+
+    def within(self, query: str, max_cost: float) -> List[Tuple[str, float]]:
+        """Все слова на расстоянии не больше max_cost от query, по возрастанию расстояния."""
+        costs = self.calculator._column_costs(query)
+        scale, n = costs[0], len(query)
+        limit = max_cost * (scale or 1) + 1e-9
+        labels, offsets, terminals = self.labels, self.offsets, self.terminals
+
+        # Обход в глубину: поддерево отсекается, если минимум столбца больше порога
+        matches = []
+        stack = [(0, self.calculator._first_column(query, costs))]
+        self.visited = 1
+        if terminals[0] >= 0 and stack[0][1][n] <= limit:
+            matches.append((self._distance(stack[0][1][n], scale), self.words[terminals[0]]))
+        while stack:
+            node, prev = stack.pop()
+            for child in range(offsets[node], offsets[node + 1]):
+                column, lowest = self.calculator._next_column(query, costs, prev, labels[child])
+                self.visited += 1
+                if lowest > limit:
+                    continue
+                if terminals[child] >= 0 and column[n] <= limit:
+                    matches.append((self._distance(column[n], scale), self.words[terminals[child]]))
+                stack.append((child, column))
+        return [(word, distance) for distance, word in sorted(matches)]
+
+    def nearest(self, query: str, count: int = 1) -> List[Tuple[str, float]]:
+        """count ближайших к query слов, по возрастанию расстояния (при равенстве - по алфавиту)."""
+        if count < 1:
+            raise ValueError("count must be positive")
+        costs = self.calculator._column_costs(query)
+        scale, n = costs[0], len(query)
+        labels, offsets, terminals = self.labels, self.offsets, self.terminals
+
+        # Поиск по первому наилучшему: в куче узлы с нижней оценкой (минимум столбца) и найденные слова
+        # с точным расстоянием. При равных значениях узлы извлекаются раньше слов, поэтому слово
+        # извлекается, только когда все слова не дальше него уже в куче.
+        heap: List[tuple] = [(0, 0, 0, self.calculator._first_column(query, costs))]
+        matches = []
+        self.visited = 1
+        while heap and len(matches) < count:
+            value, kind, item, column = heapq.heappop(heap)
+            if kind == 1:
+                matches.append((self.words[item], self._distance(value, scale)))
+                continue
+            if terminals[item] >= 0:
+                heapq.heappush(heap, (column[n], 1, terminals[item], None))
+            for child in range(offsets[item], offsets[item + 1]):
+                child_column, lowest = self.calculator._next_column(query, costs, column, labels[child])
+                self.visited += 1
+                heapq.heappush(heap, (lowest, 0, child, child_column))
+        return matches
+
+    def save(self, path: str) -> None:
+        """
+        Сохраняет индекс в файл .npz: массивы дерева, слова и параметры калькулятора.
+        Загрузка через load не перестраивает дерево.
+        """
+        calculator = self.calculator
+        params = {
+            'version': INDEX_VERSION,
+            'special_replacer': calculator.special_replacer,
+            'special_replace_cost': calculator.special_replace_cost,
+            'special_deletion_symbol': calculator.special_deletion_symbol,
+            'special_deletion_cost': calculator.special_deletion_cost,
+        }
+        with open(path, 'wb') as file:
+            np.savez(file,
+                     params=np.array(json.dumps(params)),
+                     words=np.array(json.dumps(self.words, ensure_ascii=False)),
+                     labels=np.array([ord(ch) for ch in self.labels], dtype=np.uint32),
+                     offsets=np.array(self.offsets, dtype=np.int64),
+                     terminals=np.array(self.terminals, dtype=np.int64))
+
+    @classmethod
+    def load(cls, path: str) -> 'LevenshteinIndex':
+        """Загружает индекс, сохраненный методом save."""
+        with np.load(path) as data:
+            params = json.loads(str(data['params']))
+            if params.pop('version') != INDEX_VERSION:
+                raise ValueError(f"Unsupported index version in {path}")
+            index = cls.__new__(cls)
+            index.calculator = LevenshteinCalculator(**params)
+            index.words = json.loads(str(data['words']))
+            index.visited = 0
+            index._set_arrays(data['labels'].tolist(), data['offsets'].tolist(), data['terminals'].tolist())
+        return index
@@ -0,0 +1,248 @@
+import argparse
+import mmap
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Optional, Union
+from colorama import Fore, Style
+from levenshtein_calculator import LevenshteinCalculator
+
+# Размер блока чтения по умолчанию (символов или байт)
+CHUNK_SIZE = 1 << 16
+
+# Источник: путь к файлу, '-' (стандартный ввод), открытый файл или итерируемые блоки строк/байт
+Source = Union[str, Iterable]
+
+
+def _open(source: Source, binary: bool):
+    """Открывает путь к файлу или '-'; возвращает (файл, нужно ли закрыть)."""
+    if isinstance(source, str):
+        if source == '-':
+            return (sys.stdin.buffer if binary else sys.stdin), False
+        return (open(source, 'rb') if binary else open(source, encoding='utf-8', newline='')), True
+    return source, False
+
+
+def iter_chunks(source: Source, binary: bool = False, chunk_size: int = CHUNK_SIZE,
+                use_mmap: bool = False) -> Iterator:
+    """
+    Читает источник блоками: str в текстовом режиме, bytes в байтовом.
+    При use_mmap файл отображается в память, и блоки - срезы отображения без буфера чтения.
+    """
+    if use_mmap:
+        if not binary or not isinstance(source, str) or source == '-':
+            raise ValueError("Memory-mapped input requires binary mode and a file path")
+        with open(source, 'rb') as file:
+            if file.seek(0, 2) == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for start in range(0, len(mapped), chunk_size):
+                    yield mapped[start:start + chunk_size]
+        return
+
+    file, owned = _open(source, binary)
+    try:
+        if hasattr(file, 'read'):
+            while True:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        else:
+            yield from file
+    finally:
+        if owned:
+            file.close()
+
+
+def _symbol(symbol: str, binary: bool):
+    """Особый символ в представлении входа: сам символ или значение байта (None, если не один байт)."""
+    if not binary:
+        return symbol
+    encoded = symbol.encode('utf-8')
+    return encoded[0] if len(encoded) == 1 else None
+
+
+def _load_target(target: Source, binary: bool, use_mmap: bool, chunk_size: int):
+    """Целевая последовательность с произвольным доступом: отображение файла в память или строка/байты."""
+    if use_mmap:
+        if not binary or not isinstance(target, str) or target == '-':
+            raise ValueError("Memory-mapped input requires binary mode and a file path")
+        with open(target, 'rb') as file:
+            if file.seek(0, 2) == 0:
+                return b''
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return (b'' if binary else '').join(iter_chunks(target, binary, chunk_size))
+
+
+def stream_distance(source: Source, target: Source, calculator: Optional[LevenshteinCalculator] = None,
+                    binary: bool = False, chunk_size: int = CHUNK_SIZE, use_mmap: bool = False) -> float:
+    """
+    Точное расстояние от source до target без загрузки source в память.
+    source читается блоками, и на каждый символ обновляется одна скользящая строка DP вдоль target,
+    поэтому память - O(len(target)) (целевая строка и две строки DP). В байтовом режиме с use_mmap
+    целевой файл отображается в память и тоже не читается целиком.
+    """
+    calculator = calculator or LevenshteinCalculator()
+    scale, replace_cost, deletion_cost, unit = calculator._scaled_costs()
+    replacer = _symbol(calculator.special_replacer, binary)
+    deletion_symbol = _symbol(calculator.special_deletion_symbol, binary)
+    t = _load_target(target, binary, use_mmap, chunk_size)
+    try:
+        m = len(t)
+        prev = array('q' if scale else 'd', [0]) * (m + 1)
+        for j in range(1, m + 1):
+            prev[j] = prev[j-1] + unit
+        cur = array(prev.typecode, prev)
+        for chunk in iter_chunks(source, binary, chunk_size):
+            for a in chunk:
+                del_cost = deletion_cost if a == deletion_symbol else unit
+                left = prev[0] + del_cost
+                cur[0] = left = left if scale else round(left, 2)
+                diagonal = prev[0]
+                for j in range(1, m + 1):
+                    up = prev[j]
+                    value = up + del_cost
+                    candidate = left + unit
+                    if candidate < value:
+                        value = candidate
+                    b = t[j-1]
+                    candidate = diagonal if a == b else diagonal + (replace_cost if b == replacer else unit)
+                    if candidate < value:
+                        value = candidate
+                    if scale is None:
+                        value = round(value, 2)
+                    cur[j] = left = value
+                    diagonal = up
+                prev, cur = cur, prev
+        return calculator._round_cost(prev[m] / scale if scale else prev[m])
+    finally:
+        if isinstance(t, mmap.mmap):
+            t.close()
+
+
+class _TargetWindow:
+    """Окно потока целевых символов: t[j-1] доступен, пока j не меньше начала окна."""
+
+    def __init__(self, chunks: Iterator):
+        self.chunks = chunks
+        self.buffer: List = []
+        self.offset = 0
+        self.length: Optional[int] = None
+
+    def has(self, j: int) -> bool:
+        """Есть ли символ t[j-1]; при необходимости дочитывает поток."""
+        while self.offset + len(self.buffer) < j:
+            if self.length is not None:
+                return False
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.length = self.offset + len(self.buffer)
+                return False
+            self.buffer.extend(chunk)
+        return True
+
+    def __getitem__(self, j: int):
+        return self.buffer[j - 1 - self.offset]
+
+    def discard_before(self, j: int) -> None:
+        """Освобождает символы t[0..j-2], которые полосе больше не нужны."""
+        drop = j - 1 - self.offset
+        if drop > CHUNK_SIZE and drop * 2 > len(self.buffer):
+            del self.buffer[:drop]
+            self.offset += drop
+
+
+def stream_distance_bounded(source: Source, target: Source, max_cost: float,
+                            calculator: Optional[LevenshteinCalculator] = None, binary: bool = False,
+                            chunk_size: int = CHUNK_SIZE, use_mmap: bool = False) -> Optional[float]:
+    """
+    Расстояние от source до target, если оно не больше max_cost, иначе None; оба входа читаются потоком.
+    Хранится только полоса строки DP, клетки которой не дороже max_cost, и окно target под ней,
+    поэтому память ограничена шириной полосы (порядка max_cost на минимальную стоимость операции)
+    и не зависит от длины входов. Расчет прекращается, как только полоса опустеет.
+    """
+    calculator = calculator or LevenshteinCalculator()
+    scale, replace_cost, deletion_cost, unit = calculator._scaled_costs()
+    replacer = _symbol(calculator.special_replacer, binary)
+    deletion_symbol = _symbol(calculator.special_deletion_symbol, binary)
+    limit = max_cost * (scale or 1) + 1e-9
+    inf = float('inf')
+    targets = _TargetWindow(iter_chunks(target, binary, chunk_size, use_mmap))
+
+    if limit < 0:
+        return None
+    # Полоса строки DP: row[k] = D[i][lo + k]
+    row = [0]
+    while targets.has(len(row)) and row[-1] + unit <= limit:
+        row.append(row[-1] + unit)
+    lo = 0
+    for chunk in iter_chunks(source, binary, chunk_size, use_mmap):
+        for a in chunk:
+            del_cost = deletion_cost if a == deletion_symbol else unit
+            hi = lo + len(row) - 1
+            new: List = []
+            new_lo = -1
+            left = inf
+            j = lo
+            while j == 0 or targets.has(j):
+                best = row[j - lo] + del_cost if j <= hi else inf
+                if j > lo and j - 1 <= hi:
+                    b = targets[j]
+                    diagonal = row[j - 1 - lo]
+                    candidate = diagonal if a == b else diagonal + (replace_cost if b == replacer else unit)
+                    if candidate < best:
+                        best = candidate
+                if left + unit < best:
+                    best = left + unit
+                if scale is None and best != inf:
+                    best = round(best, 2)
+                if best > limit:
+                    best = inf
+                    if j > hi:
+                        break
+                if best != inf and new_lo < 0:
+                    new_lo = j
+                if new_lo >= 0:
+                    new.append(best)
+                left = best
+                j += 1
+            if new_lo < 0:
+                return None
+            while new[-1] == inf:
+                new.pop()
+            row, lo = new, new_lo
+            targets.discard_before(lo)
+
+    hi = lo + len(row) - 1
+    if targets.has(hi + 1):
+        return None
+    m = targets.length
+    if m < lo or row[m - lo] == inf:
+        return None
+    return float(calculator._round_cost(row[m - lo] / scale if scale else row[m - lo]))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Расстояние Левенштейна между большими файлами потоком')
+    parser.add_argument('source', help="исходный файл или '-' для стандартного ввода")
+    parser.add_argument('target', help="целевой файл или '-' для стандартного ввода")
+    parser.add_argument('--max-cost', type=float, help='вычислять только расстояния не больше порога')
+    parser.add_argument('--binary', action='store_true', help='сравнивать байты, а не символы UTF-8')
+    parser.add_argument('--mmap', action='store_true', help='отображать файлы в память (только с --binary)')
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--replacer', nargs=2, default=['*', '0.5'], metavar=('SYMBOL', 'COST'))
+    parser.add_argument('--deletion', nargs=2, default=['#', '0.5'], metavar=('SYMBOL', 'COST'))
+    arguments = parser.parse_args()
+
+    calculator = LevenshteinCalculator(arguments.replacer[0], float(arguments.replacer[1]),
+                                       arguments.deletion[0], float(arguments.deletion[1]))
+    if arguments.max_cost is None:
+        result = stream_distance(arguments.source, arguments.target, calculator, arguments.binary,
+                                 arguments.chunk_size, arguments.mmap)
+    else:
+        result = stream_distance_bounded(arguments.source, arguments.target, arguments.max_cost, calculator,
+                                         arguments.binary, arguments.chunk_size, arguments.mmap)
+    if result is None:
+        print(Fore.YELLOW + f"Расстояние Левенштейна больше {arguments.max_cost}")
+    else:
+        print(Fore.GREEN + Style.BRIGHT + f"РЕЗУЛЬТАТ: Расстояние Левенштейна = {result}")